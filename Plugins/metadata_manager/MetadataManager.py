@@ -33,6 +33,7 @@ from .resources import *
 from .MetadataManager_dockwidget import MetadataManagerDockWidget
 from .db.manager import DatabaseManager
 from .db.migrations import MigrationManager
+from .db.schema import DatabaseSchema
 import os.path
 from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox
 from qgis.core import QgsMessageLog, Qgis
@@ -41,7 +42,7 @@ from qgis.core import QgsMessageLog, Qgis
 class MetadataManager:
     """QGIS Plugin Implementation."""
 
-    __version__ = "0.4.1"
+    __version__ = "0.4.2"
 
     def __init__(self, iface):
         """Constructor.
@@ -318,7 +319,7 @@ class MetadataManager:
                     "Database schema needs upgrade from version {} to {}.\n\n"
                     "Would you like to upgrade now?\n\n"
                     "Recommendation: Back up your database first."
-                ).format(current_version or "Unknown", DatabaseManager.__version__),
+                ).format(current_version or "Unknown", DatabaseSchema.METADATA_SCHEMA_VERSION),
                 QMessageBox.Yes | QMessageBox.No
             )
 
@@ -24,10 +24,12 @@ users through creating layer-specific metadata elements for those layers in an i
  ***************************************************************************/
 """
 
+__version__ = "0.1.0"
+
 import os
 
 from qgis.PyQt import QtGui, QtWidgets, uic
-from qgis.PyQt.QtCore import pyqtSignal
+from qgis.PyQt.QtCore import pyqtSignal, QTimer
 
 from .widgets import DashboardWidget, MetadataWizard, LayerListWidget, InventoryWidget
 
@@ -39,6 +41,9 @@ class MetadataManagerDockWidget(QtWidgets.QDockWidget, FORM_CLASS):
 
     closingPlugin = pyqtSignal()
 
+    # How often to refresh SQLite planner statistics while the dock is open
+    OPTIMIZE_INTERVAL_MS = 15 * 60 * 1000
+
     def __init__(self, parent=None):
         """Constructor."""
         super(MetadataManagerDockWidget, self).__init__(parent)
@@ -57,6 +62,11 @@ class MetadataManagerDockWidget(QtWidgets.QDockWidget, FORM_CLASS):
         self.layer_list_widget = None
         self.tab_widget = None
 
+        # Periodic PRAGMA optimize for the long-lived plugin connection
+        self.optimize_timer = QTimer(self)
+        self.optimize_timer.setInterval(self.OPTIMIZE_INTERVAL_MS)
+        self.optimize_timer.timeout.connect(self.optimize_database)
+
     def set_database_manager(self, db_manager):
         """
         Set database manager instance.
@@ -105,6 +115,13 @@ class MetadataManagerDockWidget(QtWidgets.QDockWidget, FORM_CLASS):
             self.dashboard_widget.refresh_statistics()
             self.layer_list_widget.load_layers()
 
+        self.optimize_timer.start()
+
+    def optimize_database(self):
+        """Let SQLite refresh planner statistics on the open database."""
+        if self.db_manager and self.db_manager.is_connected:
+            self.db_manager.optimize()
+
     def _connect_signals(self):
         """Connect widget signals."""
         # Inventory → Database and widgets refresh
@@ -155,6 +172,10 @@ class MetadataManagerDockWidget(QtWidgets.QDockWidget, FORM_CLASS):
             gpkg_path: Path to updated GeoPackage
             layer_name: Name of inventory layer
         """
+        # The rescan rewrote geospatial_inventory, dropping its indexes
+        if self.db_manager and self.db_manager.is_connected:
+            self.db_manager.ensure_indexes()
+
         # Refresh displays
         if self.dashboard_widget:
             self.dashboard_widget.refresh_statistics()
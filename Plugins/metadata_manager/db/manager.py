@@ -8,17 +8,342 @@ Author: John Zastrow
 License: MIT
 """
 
+__version__ = "0.2.0"
+
+import os
+import platform
+import re
 import sqlite3
 import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Tuple, Iterable, Iterator
 
 from qgis.core import QgsMessageLog, Qgis
+from qgis.PyQt.QtCore import QSettings
 
 from .schema import DatabaseSchema
 
 
+def _spatialite_candidates() -> List[str]:
+    """Return SpatiaLite library names to try, in order (path varies by platform)."""
+    candidates = ["mod_spatialite", "libspatialite"]
+    if platform.system() == "Windows":
+        # On Windows, might be in QGIS install
+        qgis_prefix = os.environ.get('QGIS_PREFIX_PATH', '')
+        if qgis_prefix:
+            candidates.append(os.path.join(qgis_prefix, 'bin', 'mod_spatialite'))
+    return candidates
+
+
+# Resolved once per QGIS session and shared by all connections:
+# None = not probed yet, '' = no candidate loads, otherwise the working name
+_SPATIALITE_CANDIDATES = _spatialite_candidates()
+_spatialite_extension: Optional[str] = None
+
+
+# All SQL is kept in module-level constants so every call passes identical
+# SQL text, which lets the connection's prepared statement cache (keyed by
+# SQL text) reuse compiled plans instead of re-parsing them.
+
+SQL_INVENTORY_TABLE_EXISTS = """
+SELECT name FROM sqlite_master
+WHERE type='table' AND name='geospatial_inventory'
+"""
+
+SQL_CACHE_TABLE_EXISTS = """
+SELECT name FROM sqlite_master
+WHERE type='table' AND name='metadata_cache'
+"""
+
+SQL_EXISTING_TABLES = """
+SELECT name FROM sqlite_master
+WHERE type='table' AND name IN ('geospatial_inventory', 'metadata_cache')
+"""
+
+SQL_INVENTORY_COLUMNS = "PRAGMA table_info(geospatial_inventory)"
+
+SQL_INDEX_COUNT = "SELECT COUNT(*) FROM sqlite_master WHERE type='index'"
+
+SQL_DATA_VERSION = "PRAGMA data_version"
+
+SQL_OPTIMIZE = "PRAGMA optimize"
+
+# Connect-time variant: 0x10000 also checks tables the connection has not
+# queried yet, 0x2 runs ANALYZE where statistics look stale
+SQL_OPTIMIZE_ON_CONNECT = "PRAGMA optimize=0x10002"
+
+SQL_GET_SCHEMA_VERSION = "SELECT value FROM plugin_info WHERE key = ?"
+
+SQL_LOAD_CACHE_WITH_LAYER = "SELECT metadata_json FROM metadata_cache WHERE layer_path = ? AND layer_name = ?"
+
+SQL_LOAD_CACHE_NO_LAYER = "SELECT metadata_json FROM metadata_cache WHERE layer_path = ?"
+
+SQL_LAYERS_FOR_PATH = "SELECT file_path, layer_name FROM geospatial_inventory WHERE file_path = ? LIMIT 5"
+
+SQL_UPDATE_SCHEMA_VERSION = """
+INSERT INTO plugin_info (key, value, updated)
+VALUES (?, ?, datetime('now'))
+ON CONFLICT(key) DO UPDATE SET
+    value = excluded.value,
+    updated = excluded.updated
+"""
+
+SQL_LOG_UPGRADE = """
+INSERT INTO upgrade_history (from_version, to_version, tool, success, notes)
+VALUES (?, ?, 'metadata_manager', ?, ?)
+"""
+
+SQL_UPDATE_INVENTORY_STATUS = """
+UPDATE geospatial_inventory
+SET
+    metadata_status = ?,
+    metadata_last_updated = ?,
+    metadata_target = ?,
+    metadata_cached = ?
+WHERE file_path = ? AND layer_name = ?
+"""
+
+# Read-only probe for the status fix; stops at the first offending layer
+SQL_HAS_INCORRECT_STATUS = """
+SELECT EXISTS (
+    SELECT 1
+    FROM geospatial_inventory gi
+    LEFT JOIN metadata_cache mc
+        ON mc.layer_path = gi.file_path
+        AND mc.layer_name = gi.layer_name
+    WHERE gi.metadata_status = 'complete'
+    AND mc.layer_path IS NULL
+)
+"""
+
+SQL_FIX_INCORRECT_STATUS = """
+UPDATE geospatial_inventory
+SET metadata_status = 'none',
+    metadata_cached = 0,
+    metadata_last_updated = ?
+WHERE rowid IN (
+    SELECT gi.rowid
+    FROM geospatial_inventory gi
+    LEFT JOIN metadata_cache mc
+        ON mc.layer_path = gi.file_path
+        AND mc.layer_name = gi.layer_name
+    WHERE gi.metadata_status = 'complete'
+    AND mc.layer_path IS NULL
+)
+"""
+
+# SQLite 3.33+ can join in UPDATE ... FROM, applying the anti-join result
+# once instead of testing rowid membership per row
+SQL_FIX_INCORRECT_STATUS_FROM = """
+UPDATE geospatial_inventory AS gi
+SET metadata_status = 'none',
+    metadata_cached = 0,
+    metadata_last_updated = ?
+FROM (
+    SELECT gi2.rowid AS rid
+    FROM geospatial_inventory gi2
+    LEFT JOIN metadata_cache mc
+        ON mc.layer_path = gi2.file_path
+        AND mc.layer_name = gi2.layer_name
+    WHERE gi2.metadata_status = 'complete'
+    AND mc.layer_path IS NULL
+) AS sub
+WHERE gi.rowid = sub.rid
+"""
+
+SQL_UPDATE_WRITE_STATUS = """
+UPDATE metadata_cache
+SET
+    last_written_date = ?,
+    target_location = ?,
+    in_sync = ?
+WHERE layer_path = ? AND layer_name = ?
+"""
+
+def _sqlite_now() -> str:
+    """
+    Current UTC time in the format of SQLite's datetime('now').
+
+    Bound as a parameter so batched statements record one timestamp and
+    their SQL text stays constant.
+    """
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Inventory columns read for smart defaults, in SELECT order; rows are
+# fetched as plain tuples and zipped with these names. The core set covers
+# what the metadata wizard fills in on first load, the extras (extents, file
+# details, etc.) are only read when a caller asks for them.
+SMART_DEFAULTS_KEY_COLUMNS = ('layer_name', 'file_path')
+
+SMART_DEFAULTS_CORE_COLUMNS = SMART_DEFAULTS_KEY_COLUMNS + (
+    'layer_title',
+    'layer_abstract',
+    'keywords',
+    'lineage',
+    'constraints',
+    'geometry_type',
+    'feature_count',
+    'field_names',
+    'field_types',
+    'band_count',
+    'raster_width',
+    'raster_height',
+    'pixel_width',
+)
+
+SMART_DEFAULTS_EXTRA_COLUMNS = SMART_DEFAULTS_KEY_COLUMNS + (
+    'format',
+    'data_type',
+    'crs_authid',
+    'native_extent',
+    'wgs84_extent',
+    'pixel_height',
+    'nodata_value',
+    'data_types',
+    'file_created',
+    'file_modified',
+    'file_size_mb',
+    'url',
+    'contact_info',
+    'parent_directory',
+)
+
+SMART_DEFAULTS_COLUMNS = (
+    SMART_DEFAULTS_CORE_COLUMNS
+    + SMART_DEFAULTS_EXTRA_COLUMNS[len(SMART_DEFAULTS_KEY_COLUMNS):]
+)
+
+_SMART_DEFAULTS_EXTRA_COUNT = len(SMART_DEFAULTS_EXTRA_COLUMNS) - len(SMART_DEFAULTS_KEY_COLUMNS)
+
+
+@lru_cache(maxsize=4)
+def _smart_defaults_sql(columns: Tuple[str, ...]) -> str:
+    """Build the smart-defaults SELECT for one (path, name) pair."""
+    select_list = ', '.join(columns)
+    return f"""
+SELECT {select_list}
+FROM geospatial_inventory
+WHERE file_path = ? AND layer_name = ? AND retired_datetime IS NULL
+LIMIT 1
+"""
+
+
+def _parse_list_column(value: Optional[str]) -> List[str]:
+    """
+    Parse an inventory list column (keywords, field names/types).
+
+    The plugin's inventory processor stores these as JSON arrays; inventories
+    written by older versions or the standalone Inventory Miner script use
+    comma-separated text, which is still accepted.
+    """
+    if not value:
+        return []
+    if value[0] == '[':
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value.split(',')
+
+
+def _copy_smart_defaults(defaults: Dict) -> Dict:
+    """Copy a smart defaults dict, including its list values, for a caller."""
+    return {
+        key: value[:] if isinstance(value, list) else value
+        for key, value in defaults.items()
+    }
+
+
+# Layer name -> title conversion (see DatabaseManager._convert_to_title_case)
+_TITLE_EXTENSION_RE = re.compile(r'\.(?:shp|tiff?|gpkg|geojson|kml|gml)$', re.IGNORECASE)
+_TITLE_SEPARATOR_RE = re.compile(r'[_\-]+')
+# Letter runs at the start of a word, so "10m" keeps its lowercase unit
+_TITLE_WORD_RE = re.compile(r'\b[^\W\d_]+')
+_TITLE_ABBREVIATIONS = {
+    'usa': 'USA', 'us': 'US', 'uk': 'UK',
+    'dem': 'DEM', 'dsm': 'DSM', 'dtm': 'DTM',
+    'gps': 'GPS', 'gis': 'GIS', 'crs': 'CRS',
+    'utm': 'UTM', 'wgs': 'WGS', 'nad': 'NAD',
+    'id': 'ID', 'url': 'URL', 'api': 'API'
+}
+
+
+def _title_word(match) -> str:
+    """Capitalize one word, upper-casing known abbreviations."""
+    word = match.group()
+    return _TITLE_ABBREVIATIONS.get(word.lower()) or word.capitalize()
+
+
+@lru_cache(maxsize=4096)
+def _layer_name_to_title(layer_name: str) -> str:
+    """Convert a layer name to a Title Case title (memoized, pure)."""
+    title = _TITLE_EXTENSION_RE.sub('', layer_name)
+    title = _TITLE_SEPARATOR_RE.sub(' ', title)
+    title = _TITLE_WORD_RE.sub(_title_word, title)
+    return ' '.join(title.split())
+
+
+# Dashboard statistics are rolled up from this single grouped scan
+SQL_STATS_ALL = """
+SELECT
+    parent_directory,
+    data_type,
+    format,
+    crs_authid,
+    metadata_status,
+    COUNT(*) as count
+FROM geospatial_inventory
+WHERE retired_datetime IS NULL
+GROUP BY parent_directory, data_type, format, crs_authid, metadata_status
+"""
+
+SQL_SAVE_METADATA_CACHE = """
+INSERT INTO metadata_cache (
+    layer_path,
+    layer_name,
+    metadata_json,
+    created_date,
+    last_edited_date,
+    in_sync
+) VALUES (?, ?, ?, datetime('now'), datetime('now'), ?)
+ON CONFLICT(layer_path, layer_name) DO UPDATE SET
+    metadata_json = excluded.metadata_json,
+    last_edited_date = excluded.last_edited_date,
+    in_sync = excluded.in_sync
+"""
+
+# Whether metadata_cache has a unique index on exactly (layer_path, layer_name),
+# the conflict target of SQL_SAVE_METADATA_CACHE
+SQL_HAS_CACHE_KEY_INDEX = """
+SELECT EXISTS (
+    SELECT 1 FROM pragma_index_list('metadata_cache') AS il
+    WHERE il."unique"
+      AND (SELECT group_concat(name) FROM (
+              SELECT name FROM pragma_index_info(il.name) ORDER BY name
+          )) = 'layer_name,layer_path'
+)
+"""
+
+# UPDATE ... FROM needs SQLite 3.33; the library version is fixed per process
+_HAS_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+
+# Compact JSON for cached metadata; nothing reads the stored text directly
+_JSON_SEPARATORS = (',', ':')
+
+
+def _dump_metadata_json(metadata: Dict) -> str:
+    """Serialize metadata for metadata_cache (compact, non-ASCII kept as UTF-8)."""
+    return json.dumps(metadata, separators=_JSON_SEPARATORS, ensure_ascii=False)
+
+# Tally slot for each metadata_status value: [total, complete, partial, none]
+_STATUS_SLOTS = {'complete': 1, 'partial': 2, 'none': 3, None: 3}
+
+
 class DatabaseManager:
     """
     Manages unified GeoPackage database shared with Inventory Miner.
@@ -30,6 +355,30 @@ class DatabaseManager:
     - Provide connection management
     """
 
+    # Prepared statements kept per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 256
+
+    # Rows fetched per batch by iter_query() scans
+    STREAM_ARRAY_SIZE = 500
+
+    # Number of recently loaded metadata_cache entries kept in memory
+    METADATA_LRU_SIZE = 128
+
+    # Number of recently built smart-defaults dictionaries kept in memory
+    SMART_DEFAULTS_LRU_SIZE = 256
+
+    # Seconds to wait on a locked database before raising SQLITE_BUSY
+    BUSY_TIMEOUT = 5.0
+
+    # Per-connection tuning applied after every connect. journal_mode is
+    # handled separately because WAL is not safe on network shares.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",     # 64 MB page cache
+        "PRAGMA mmap_size=268435456",   # 256 MB memory-mapped I/O
+    )
+
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize database manager.
@@ -41,59 +390,115 @@ class DatabaseManager:
         self.connection: Optional[sqlite3.Connection] = None
         self.is_connected = False
 
+        # Read-only connection for dashboard statistics, opened on first use;
+        # False once opening it has failed for the current database
+        self._ro_connection = None
+        self.has_spatialite = False
+
+        # Info messages are formatted and sent only when the configured level
+        # allows them; warnings, errors and successes are always logged
+        self._log_info = self._read_log_level() <= Qgis.Info
+
+        # Schema introspection results, reset whenever the connection changes
+        self._validated: Optional[Tuple[bool, str]] = None
+        self._tables_exist: Optional[bool] = None
+
+        # Recently loaded metadata JSON keyed by (layer_path, layer_name).
+        # Text is kept rather than dicts so callers always get a fresh copy.
+        self._metadata_lru: "OrderedDict[Tuple[str, Optional[str]], str]" = OrderedDict()
+        self._metadata_lru_version: Optional[int] = None
+
+        # Recently built smart defaults keyed by (layer_path, layer_name,
+        # with_core, with_extras); dropped when the inventory may have changed
+        self._defaults_lru: "OrderedDict[Tuple[str, str, bool, bool], Dict]" = OrderedDict()
+        self._defaults_lru_version: Optional[int] = None
+
+        # Nesting depth of batch() blocks; commits are deferred while > 0
+        self._batch_depth = 0
+
+        # One entry per open with-block: whether it found no connection open
+        self._with_opened: List[bool] = []
+
+        # Single-pass dashboard statistics, valid while PRAGMA data_version
+        # matches; commits through this manager drop it in _commit()
+        self._stats_cache: Optional[Dict] = None
+        self._stats_token: Optional[int] = None
+
+    @staticmethod
+    def _read_log_level() -> int:
+        """
+        Read the minimum message level from QSettings (MetadataManager/log_level).
+
+        Returns:
+            Qgis message level, Qgis.Info if unset or invalid
+        """
+        try:
+            return int(QSettings().value('MetadataManager/log_level', Qgis.Info))
+        except (TypeError, ValueError):
+            return Qgis.Info
+
     def connect(self, db_path: str) -> bool:
         """
         Connect to database.
 
+        Connecting again to the database that is already open keeps the
+        existing connection but still recreates missing indexes, since a
+        rescan may have rewritten the inventory; connecting to a different
+        one closes it first.
+
         Args:
             db_path: Path to GeoPackage database
 
         Returns:
             True if connected successfully
         """
+        if self.connection is not None:
+            if self._same_database(self.db_path, db_path):
+                # The plugin's panels share this manager; reuse the open,
+                # already configured connection instead of reopening it
+                self._validated = None
+                self._tables_exist = None
+                self.ensure_indexes()
+                return True
+            self.disconnect()
+
         try:
             self.db_path = db_path
-            self.connection = sqlite3.connect(db_path)
-            self.connection.row_factory = sqlite3.Row
+            self._ro_connection = None
+            self._metadata_lru.clear()
+            self._metadata_lru_version = None
+            self._defaults_lru.clear()
+            self._defaults_lru_version = None
+            self._stats_cache = None
+            self._stats_token = None
+            self._validated = None
+            self._tables_exist = None
+            # Autocommit mode: single statements commit on their own and
+            # multi-statement writes open explicit transactions (_begin/batch)
+            self.connection = sqlite3.connect(
+                db_path,
+                timeout=self.BUSY_TIMEOUT,
+                isolation_level=None,
+                cached_statements=self.STATEMENT_CACHE_SIZE
+            )
+            # Rows are plain tuples by default; execute_query() hands out
+            # sqlite3.Row for callers that read columns by name
+            self._configure_connection(db_path)
 
             # Load SpatiaLite extension (required for GeoPackage operations)
             # This enables spatial functions like ST_IsEmpty used by inventory triggers
-            self.connection.enable_load_extension(True)
-            try:
-                # Try loading SpatiaLite (path varies by platform)
-                try:
-                    self.connection.load_extension("mod_spatialite")
-                except:
-                    try:
-                        self.connection.load_extension("libspatialite")
-                    except:
-                        # On Windows, might be in QGIS install
-                        import platform
-                        if platform.system() == "Windows":
-                            import os
-                            qgis_prefix = os.environ.get('QGIS_PREFIX_PATH', '')
-                            if qgis_prefix:
-                                spatialite_path = os.path.join(qgis_prefix, 'bin', 'mod_spatialite')
-                                self.connection.load_extension(spatialite_path)
-                        else:
-                            raise
-            except Exception as ext_error:
-                QgsMessageLog.logMessage(
-                    f"Warning: Could not load SpatiaLite extension: {ext_error}\n"
-                    f"Spatial functions may not work in triggers.",
-                    "Metadata Manager",
-                    Qgis.Warning
-                )
-            finally:
-                self.connection.enable_load_extension(False)
+            self.has_spatialite = self._load_spatialite()
 
             self.is_connected = True
+            self.ensure_indexes()
+            self.optimize(SQL_OPTIMIZE_ON_CONNECT)
 
-            QgsMessageLog.logMessage(
-                f"Connected to database: {db_path}",
-                "Metadata Manager",
-                Qgis.Info
-            )
+            if self._log_info:
+                QgsMessageLog.logMessage(
+                    f"Connected to database: {db_path}",
+                    "Metadata Manager",
+                    Qgis.Info
+                )
             return True
 
         except Exception as e:
@@ -105,83 +510,360 @@ class DatabaseManager:
             self.is_connected = False
             return False
 
+    def _load_spatialite(self) -> bool:
+        """
+        Load the SpatiaLite extension into the current connection.
+
+        The first connection of the session probes the candidate libraries;
+        later connections load the one that worked directly, or skip loading
+        if none did.
+
+        Returns:
+            True if SpatiaLite was loaded
+        """
+        global _spatialite_extension
+
+        if _spatialite_extension == '':
+            return False
+        if _spatialite_extension:
+            candidates = [_spatialite_extension]
+        else:
+            candidates = _SPATIALITE_CANDIDATES
+
+        last_error: Optional[Exception] = None
+        try:
+            self.connection.enable_load_extension(True)
+            try:
+                for candidate in candidates:
+                    try:
+                        self.connection.load_extension(candidate)
+                    except sqlite3.Error as e:
+                        last_error = e
+                        continue
+                    if _spatialite_extension is None and self._log_info:
+                        QgsMessageLog.logMessage(
+                            f"Loaded SpatiaLite extension: {candidate}",
+                            "Metadata Manager",
+                            Qgis.Info
+                        )
+                    _spatialite_extension = candidate
+                    return True
+            finally:
+                self.connection.enable_load_extension(False)
+        except (AttributeError, sqlite3.Error) as e:
+            # Python built without extension loading support
+            last_error = e
+
+        if _spatialite_extension:
+            # Previously working library failed; probe again next time
+            _spatialite_extension = None
+        else:
+            _spatialite_extension = ''
+        QgsMessageLog.logMessage(
+            f"Warning: Could not load SpatiaLite extension: {last_error}\n"
+            f"Spatial functions may not work in triggers.",
+            "Metadata Manager",
+            Qgis.Warning
+        )
+        return False
+
+    def _configure_connection(self, db_path: str):
+        """
+        Apply journal and cache PRAGMAs to a freshly opened connection.
+
+        WAL lets the dashboard read while QGIS or a rescan writes, and with
+        synchronous=NORMAL commits no longer wait on a full fsync. WAL relies
+        on shared memory, so it is skipped for databases on network shares.
+
+        Args:
+            db_path: Path the connection was opened with
+        """
+        try:
+            if not self._is_network_path(db_path):
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            for pragma in self.CONNECTION_PRAGMAS:
+                self.connection.execute(pragma)
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f"Warning: Could not apply connection settings: {e}",
+                "Metadata Manager",
+                Qgis.Warning
+            )
+
+    @staticmethod
+    def _is_network_path(db_path: str) -> bool:
+        """
+        Check whether a database path points at a network share (UNC path).
+
+        Args:
+            db_path: Path to database
+
+        Returns:
+            True if the path is a UNC/SMB path
+        """
+        return db_path.startswith('\\\\') or db_path.startswith('//')
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """
+        Get the connection used for read-only analytics queries.
+
+        A second connection is opened with mode=ro on first use. Under WAL it
+        reads the last committed snapshot without waiting on, or holding up,
+        writes made through the main connection. While the main connection
+        has a transaction open the main connection is used so its own changes
+        are visible; it is also the fallback on network shares (no WAL) or
+        when the read-only connection cannot be opened.
+
+        Returns:
+            Read-only connection, or the main connection as a fallback
+        """
+        if self.connection.in_transaction or self._ro_connection is False:
+            return self.connection
+
+        if self._ro_connection is None:
+            if self._is_network_path(self.db_path):
+                # No WAL on network shares, so a reader would not run
+                # alongside writes anyway
+                self._ro_connection = False
+                return self.connection
+            try:
+                uri = Path(os.path.abspath(self.db_path)).as_uri() + '?mode=ro'
+                connection = sqlite3.connect(
+                    uri,
+                    uri=True,
+                    timeout=self.BUSY_TIMEOUT,
+                    isolation_level=None
+                )
+                try:
+                    for pragma in self.CONNECTION_PRAGMAS:
+                        connection.execute(pragma)
+                    connection.execute(SQL_INVENTORY_TABLE_EXISTS).fetchall()
+                except sqlite3.Error:
+                    connection.close()
+                    raise
+                self._ro_connection = connection
+            except (sqlite3.Error, ValueError) as e:
+                if self._log_info:
+                    QgsMessageLog.logMessage(
+                        f"Read-only connection unavailable, using main connection: {e}",
+                        "Metadata Manager",
+                        Qgis.Info
+                    )
+                self._ro_connection = False
+                return self.connection
+
+        return self._ro_connection
+
+    @staticmethod
+    def _same_database(path_a: Optional[str], path_b: Optional[str]) -> bool:
+        """
+        Check whether two paths refer to the same database file.
+
+        Args:
+            path_a: First database path
+            path_b: Second database path
+
+        Returns:
+            True if both paths normalize to the same file
+        """
+        if not path_a or not path_b:
+            return False
+        return (os.path.normcase(os.path.abspath(path_a))
+                == os.path.normcase(os.path.abspath(path_b)))
+
     def disconnect(self):
         """Close database connection."""
         if self.connection:
+            self.optimize()
             self.connection.close()
             self.connection = None
             self.is_connected = False
+        if self._ro_connection:
+            self._ro_connection.close()
+        self._ro_connection = None
+        self._batch_depth = 0
+        self._validated = None
+        self._tables_exist = None
+        self._metadata_lru.clear()
+        self._metadata_lru_version = None
+        self._defaults_lru.clear()
+        self._defaults_lru_version = None
+        self._stats_cache = None
+        self._stats_token = None
+
+    def optimize(self, pragma: str = SQL_OPTIMIZE) -> bool:
+        """
+        Run PRAGMA optimize so planner statistics follow the data.
+
+        Called on connect and disconnect; the plugin also calls it
+        periodically while the database stays open. Skipped while a
+        transaction is open so it never commits or holds up a batch.
+
+        Args:
+            pragma: PRAGMA optimize statement to run
+
+        Returns:
+            True if the PRAGMA ran
+        """
+        if not self.connection or self.connection.in_transaction:
+            return False
+        try:
+            self.connection.execute(pragma).fetchall()
+            return True
+        except sqlite3.Error as e:
+            # Expected on read-only files; queries still work without it
+            if self._log_info:
+                QgsMessageLog.logMessage(
+                    f"PRAGMA optimize skipped: {e}",
+                    "Metadata Manager",
+                    Qgis.Info
+                )
+            return False
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several writes into one transaction with a single commit.
+
+        Methods called inside the block skip their own commit; the whole
+        block is committed on exit, or rolled back if an exception escapes.
+        Blocks may be nested; only the outermost one commits.
+
+        Example:
+            with db_manager.batch():
+                for path, name, metadata in layers:
+                    db_manager.save_metadata_to_cache(path, name, metadata)
+                    db_manager.update_inventory_metadata_status(path, name, 'partial')
+
+        Yields:
+            This DatabaseManager
+        """
+        if self._batch_depth == 0:
+            self.connection.execute("BEGIN IMMEDIATE")
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.connection.rollback()
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.connection.commit()
+                self._stats_cache = None
+
+    def _begin(self):
+        """
+        Open an explicit write transaction unless one is already active.
+
+        The connection runs in autocommit mode, so only methods that issue
+        several statements which must succeed or fail together call this.
+        """
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+
+    def _commit(self):
+        """
+        Commit the current transaction unless inside a batch() block.
+
+        PRAGMA data_version does not change for this connection's own
+        commits, so the cached statistics are dropped here; statements run
+        in autocommit mode have already been committed when this is called.
+        """
+        if self._batch_depth == 0:
+            if self.connection.in_transaction:
+                self.connection.commit()
+            self._stats_cache = None
+
+    def _rollback(self):
+        """
+        Roll back the current transaction unless inside a batch() block.
+
+        Inside a batch the failed statement has already been undone by
+        SQLite, so the rest of the batch is kept.
+        """
+        if self._batch_depth == 0 and self.connection.in_transaction:
+            self.connection.rollback()
 
     def validate_inventory_database(self) -> Tuple[bool, str]:
         """
         Validate that database was created by Inventory Miner.
 
+        The result is cached until the next connect() or disconnect().
+
         Returns:
             Tuple of (is_valid, message)
         """
         if not self.is_connected:
             return False, "Not connected to database"
 
-        try:
-            cursor = self.connection.cursor()
-
-            # Check for geospatial_inventory table
-            cursor.execute("""
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='geospatial_inventory'
-            """)
-
-            if cursor.fetchone() is None:
-                return False, (
-                    "This database was not created by Inventory Miner. "
-                    "The 'geospatial_inventory' table is missing. "
-                    "Please run Inventory Miner first to create the database."
-                )
-
-            # Check for required metadata tracking fields in inventory
-            cursor.execute("PRAGMA table_info(geospatial_inventory)")
-            columns = {row[1] for row in cursor.fetchall()}
+        if self._validated is None:
+            try:
+                self._validated = self._validate_inventory_database()
+            except Exception as e:
+                return False, f"Validation error: {str(e)}"
+        return self._validated
+
+    def _validate_inventory_database(self) -> Tuple[bool, str]:
+        """Run the validation queries behind validate_inventory_database()."""
+        cursor = self.connection.cursor()
+
+        # Check for geospatial_inventory table
+        cursor.execute(SQL_INVENTORY_TABLE_EXISTS)
+
+        if cursor.fetchone() is None:
+            return False, (
+                "This database was not created by Inventory Miner. "
+                "The 'geospatial_inventory' table is missing. "
+                "Please run Inventory Miner first to create the database."
+            )
 
-            required_fields = {
-                'metadata_status',
-                'metadata_last_updated',
-                'metadata_target',
-                'metadata_cached',
-                'retired_datetime'
-            }
+        # Check for required metadata tracking fields in inventory
+        cursor.execute(SQL_INVENTORY_COLUMNS)
+        columns = {row[1] for row in cursor.fetchall()}
 
-            missing_fields = required_fields - columns
-            if missing_fields:
-                return False, (
-                    f"Inventory database is outdated. Missing fields: {', '.join(missing_fields)}. "
-                    f"Please update Inventory Miner to v0.2.0 or higher and re-run it."
-                )
+        required_fields = {
+            'metadata_status',
+            'metadata_last_updated',
+            'metadata_target',
+            'metadata_cached',
+            'retired_datetime'
+        }
 
-            return True, "Database validated successfully"
+        missing_fields = required_fields - columns
+        if missing_fields:
+            return False, (
+                f"Inventory database is outdated. Missing fields: {', '.join(missing_fields)}. "
+                f"Please update Inventory Miner to v0.2.0 or higher and re-run it."
+            )
 
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+        return True, "Database validated successfully"
 
     def check_metadata_manager_tables_exist(self) -> bool:
         """
         Check if Metadata Manager tables already exist.
 
+        The result is cached until the next connect() or disconnect().
+
         Returns:
             True if tables exist
         """
         if not self.is_connected:
             return False
 
+        if self._tables_exist is not None:
+            return self._tables_exist
+
         try:
             cursor = self.connection.cursor()
 
             # Check for metadata_cache table as indicator
-            cursor.execute("""
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='metadata_cache'
-            """)
+            cursor.execute(SQL_CACHE_TABLE_EXISTS)
 
-            return cursor.fetchone() is not None
+            self._tables_exist = cursor.fetchone() is not None
+            return self._tables_exist
 
         except Exception as e:
             QgsMessageLog.logMessage(
@@ -203,6 +885,7 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
+            self._begin()
 
             # Create all tables
             schemas = DatabaseSchema.get_all_schemas()
@@ -210,11 +893,12 @@ class DatabaseManager:
                 cursor.execute(schema_sql)
 
             # Insert initial data
-            initial_data = DatabaseSchema.get_initial_data()
-            for data_sql in initial_data:
-                cursor.execute(data_sql)
+            for data_sql, rows in DatabaseSchema.get_initial_data_batches():
+                cursor.executemany(data_sql, rows)
 
-            self.connection.commit()
+            self._commit()
+            self._tables_exist = True
+            self.ensure_indexes()
 
             QgsMessageLog.logMessage(
                 "Metadata Manager tables created successfully",
@@ -225,7 +909,7 @@ class DatabaseManager:
             return True, "Tables initialized successfully"
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             error_msg = f"Failed to initialize tables: {str(e)}"
             QgsMessageLog.logMessage(
                 error_msg,
@@ -234,6 +918,68 @@ class DatabaseManager:
             )
             return False, error_msg
 
+    def ensure_indexes(self) -> bool:
+        """
+        Create any missing performance indexes on existing tables.
+
+        Inventory Miner recreates geospatial_inventory on each rescan and
+        databases initialized by older versions lack the newer indexes, so
+        this runs on every connect. CREATE INDEX IF NOT EXISTS makes it cheap
+        when nothing is missing; ANALYZE only runs when an index was created.
+
+        Returns:
+            True if indexes are in place
+        """
+        if not self.is_connected:
+            return False
+
+        index_sets = {
+            'geospatial_inventory': DatabaseSchema.get_inventory_indexes(),
+            'metadata_cache': DatabaseSchema.get_metadata_cache_indexes(),
+        }
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(SQL_EXISTING_TABLES)
+            tables = [row[0] for row in cursor.fetchall()]
+            self._tables_exist = 'metadata_cache' in tables
+            if not tables:
+                return True
+
+            self._begin()
+            for drop_sql in DatabaseSchema.get_obsolete_indexes():
+                cursor.execute(drop_sql)
+            cursor.execute(SQL_INDEX_COUNT)
+            index_count = cursor.fetchone()[0]
+            for table in tables:
+                for index_sql in index_sets[table]:
+                    cursor.execute(index_sql)
+
+            if 'metadata_cache' in tables:
+                # Tables created by 0.1.0 are only unique on layer_path
+                cursor.execute(SQL_HAS_CACHE_KEY_INDEX)
+                if not cursor.fetchone()[0]:
+                    for index_sql in DatabaseSchema.get_metadata_cache_key_index():
+                        cursor.execute(index_sql)
+
+            cursor.execute(SQL_INDEX_COUNT)
+            if cursor.fetchone()[0] != index_count:
+                # Give the query planner statistics for the new indexes
+                for table in tables:
+                    cursor.execute(f"ANALYZE {table}")
+
+            self._commit()
+            return True
+
+        except Exception as e:
+            self._rollback()
+            QgsMessageLog.logMessage(
+                f"Warning: Could not create indexes: {str(e)}",
+                "Metadata Manager",
+                Qgis.Warning
+            )
+            return False
+
     def get_schema_version(self, schema_key: str = 'metadata_schema_version') -> Optional[str]:
         """
         Get schema version from plugin_info table.
@@ -249,10 +995,7 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(
-                "SELECT value FROM plugin_info WHERE key = ?",
-                (schema_key,)
-            )
+            cursor.execute(SQL_GET_SCHEMA_VERSION, (schema_key,))
             row = cursor.fetchone()
             return row[0] if row else None
 
@@ -281,17 +1024,14 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             cursor.execute(
-                """
-                INSERT OR REPLACE INTO plugin_info (key, value, updated)
-                VALUES (?, ?, datetime('now'))
-                """,
+                SQL_UPDATE_SCHEMA_VERSION,
                 (schema_key, version)
             )
-            self.connection.commit()
+            self._commit()
             return True
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Error updating schema version: {str(e)}",
                 "Metadata Manager",
@@ -318,17 +1058,14 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             cursor.execute(
-                """
-                INSERT INTO upgrade_history (from_version, to_version, tool, success, notes)
-                VALUES (?, ?, 'metadata_manager', ?, ?)
-                """,
+                SQL_LOG_UPGRADE,
                 (from_version, to_version, 1 if success else 0, notes)
             )
-            self.connection.commit()
+            self._commit()
             return True
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Error logging upgrade: {str(e)}",
                 "Metadata Manager",
@@ -352,6 +1089,7 @@ class DatabaseManager:
 
         try:
             cursor = self.connection.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query, params)
             return cursor.fetchall()
 
@@ -363,6 +1101,49 @@ class DatabaseManager:
             )
             return None
 
+    def iter_query(self, query: str, params: tuple = ()) -> Optional[Iterator[tuple]]:
+        """
+        Execute a SELECT query and stream its rows as plain tuples.
+
+        Intended for inventory-wide scans: rows are fetched
+        STREAM_ARRAY_SIZE at a time instead of materializing the whole
+        result with fetchall(). The query runs immediately, so errors are
+        reported here rather than part-way through iteration.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            Iterator over row tuples or None on error
+        """
+        if not self.is_connected:
+            return None
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.arraysize = self.STREAM_ARRAY_SIZE
+            cursor.execute(query, params)
+
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Query error: {str(e)}",
+                "Metadata Manager",
+                Qgis.Warning
+            )
+            return None
+
+        return self._stream_rows(cursor)
+
+    @staticmethod
+    def _stream_rows(cursor: sqlite3.Cursor) -> Iterator[tuple]:
+        """Yield rows from cursor one fetchmany() batch at a time."""
+        while True:
+            chunk = cursor.fetchmany()
+            if not chunk:
+                break
+            yield from chunk
+
     def execute_update(self, query: str, params: tuple = ()) -> bool:
         """
         Execute an INSERT/UPDATE/DELETE query.
@@ -380,11 +1161,14 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             cursor.execute(query, params)
-            self.connection.commit()
+            self._commit()
+            # Arbitrary SQL may have touched metadata_cache or the inventory
+            self._metadata_lru.clear()
+            self._defaults_lru.clear()
             return True
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Update error: {str(e)}",
                 "Metadata Manager",
@@ -392,50 +1176,91 @@ class DatabaseManager:
             )
             return False
 
-    def get_inventory_statistics(self) -> Optional[Dict[str, int]]:
+    def get_all_statistics(self) -> Optional[Dict]:
         """
-        Get metadata completion statistics from inventory.
+        Get all dashboard statistics from a single pass over the inventory.
+
+        One grouped query returns a count per (directory, data type, format,
+        CRS, status) combination, which is rolled up in Python into the
+        overall summary, the per-dimension breakdowns and the priority
+        recommendations. The result is cached until another connection
+        commits (PRAGMA data_version changes) or this manager commits a
+        write, so a dashboard refresh scans the inventory once instead of
+        six times.
 
         Returns:
-            Dictionary with statistics or None on error
+            Dictionary with 'summary', 'by_directory', 'by_data_type',
+            'by_file_format' and 'by_crs' entries plus 'recommendations' as
+            ranked (directory, file_format, count) tuples, or None on error
         """
         if not self.is_connected:
             return None
 
         try:
-            cursor = self.connection.cursor()
-
-            # Get total count (excluding retired)
-            cursor.execute("""
-                SELECT COUNT(*) FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-            """)
-            total = cursor.fetchone()[0]
-
-            # Get counts by status
-            cursor.execute("""
-                SELECT
-                    COALESCE(metadata_status, 'none') as status,
-                    COUNT(*) as count
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                GROUP BY metadata_status
-            """)
-
-            stats = {
-                'total': total,
-                'complete': 0,
-                'partial': 0,
-                'none': 0
-            }
-
-            for row in cursor.fetchall():
-                status = row['status']
-                count = row['count']
-                if status in stats:
-                    stats[status] = count
-
-            return stats
+            token = self.connection.execute(SQL_DATA_VERSION).fetchone()[0]
+            if self._stats_cache is not None and self._stats_token == token:
+                return self._stats_cache
+
+            summary = [0, 0, 0, 0]
+            by_directory: Dict[Optional[str], List[int]] = {}
+            by_data_type: Dict[Optional[str], List[int]] = {}
+            by_file_format: Dict[Optional[str], List[int]] = {}
+            by_crs: Dict[Optional[str], List[int]] = {}
+            needs_metadata: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+
+            # Rows are unpacked once, straight off the cursor of the
+            # read-only connection, so a long save does not stall the scan
+            cursor = self._read_connection().cursor()
+            cursor.execute(SQL_STATS_ALL)
+
+            for directory, data_type, file_format, crs, status, count in cursor:
+                slot = _STATUS_SLOTS.get(status)
+                for tallies, key in ((by_directory, directory),
+                                     (by_data_type, data_type),
+                                     (by_file_format, file_format),
+                                     (by_crs, crs)):
+                    tally = tallies.get(key)
+                    if tally is None:
+                        tally = tallies[key] = [0, 0, 0, 0]
+                    tally[0] += count
+                    if slot:
+                        tally[slot] += count
+                summary[0] += count
+                if slot:
+                    summary[slot] += count
+                if slot == 3:
+                    group = (directory, file_format)
+                    needs_metadata[group] = needs_metadata.get(group, 0) + count
+
+            # Order recommendations like ORDER BY count DESC over GROUP BY
+            # (ties keep grouping order, NULL first)
+            groups = sorted(needs_metadata, key=lambda g: (
+                g[0] is not None, g[0] or '', g[1] is not None, g[1] or ''))
+            groups.sort(key=needs_metadata.get, reverse=True)
+
+            self._stats_cache = {
+                'summary': {
+                    'total': summary[0],
+                    'complete': summary[1],
+                    'partial': summary[2],
+                    'none': summary[3]
+                },
+                'by_directory': self._build_stat_rows(
+                    by_directory, 'directory', 'Root', none_first=True),
+                'by_data_type': self._build_stat_rows(
+                    by_data_type, 'data_type', 'Unknown'),
+                'by_file_format': self._build_stat_rows(
+                    by_file_format, 'file_format', 'Unknown'),
+                'by_crs': self._build_stat_rows(by_crs, 'crs', 'Unknown'),
+                # (directory, format, count) ranked by count; the display
+                # dictionaries are only built for the rows actually requested
+                'recommendations': [
+                    (directory, file_format, needs_metadata[(directory, file_format)])
+                    for directory, file_format in groups
+                ]
+            }
+            self._stats_token = token
+            return self._stats_cache
 
         except Exception as e:
             QgsMessageLog.logMessage(
@@ -445,191 +1270,131 @@ class DatabaseManager:
             )
             return None
 
-    def get_statistics_by_directory(self) -> Optional[List[Dict]]:
+    @staticmethod
+    def _build_stat_rows(tallies: Dict[Optional[str], List[int]], label_key: str,
+                         default_label: str, none_first: bool = False) -> List[Dict]:
         """
-        Get metadata completion statistics grouped by directory.
+        Convert per-group tallies into dashboard statistic rows.
+
+        Args:
+            tallies: Mapping of group value to [total, complete, partial, none]
+            label_key: Dictionary key for the group label
+            default_label: Label used when the group value is NULL
+            none_first: Sort by layers without metadata before total
 
         Returns:
-            List of dictionaries with directory stats or None on error
+            List of statistic dictionaries, largest groups first
         """
-        if not self.is_connected:
-            return None
+        # Grouping order (NULL first), then a stable sort on the counts
+        keys = sorted(tallies, key=lambda k: (k is not None, k or ''))
+        if none_first:
+            keys.sort(key=lambda k: (tallies[k][3], tallies[k][0]), reverse=True)
+        else:
+            keys.sort(key=lambda k: tallies[k][0], reverse=True)
+
+        results = []
+        for key in keys:
+            total, complete, partial, none = tallies[key]
+            results.append({
+                label_key: key or default_label,
+                'total': total,
+                'complete': complete,
+                'partial': partial,
+                'none': none,
+                'completion_pct': (complete / total * 100) if total > 0 else 0
+            })
+        return results
+
+    def _get_statistics_section(self, section: str, limit: Optional[int] = None,
+                                offset: int = 0) -> Optional[List[Dict]]:
+        """
+        Get a copy of one section of the single-pass statistics.
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT
-                    parent_directory,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN metadata_status = 'complete' THEN 1 ELSE 0 END) as complete,
-                    SUM(CASE WHEN metadata_status = 'partial' THEN 1 ELSE 0 END) as partial,
-                    SUM(CASE WHEN metadata_status IS NULL OR metadata_status = 'none' THEN 1 ELSE 0 END) as none
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                GROUP BY parent_directory
-                ORDER BY none DESC, total DESC
-            """)
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'directory': row['parent_directory'] or 'Root',
-                    'total': row['total'],
-                    'complete': row['complete'],
-                    'partial': row['partial'],
-                    'none': row['none'],
-                    'completion_pct': (row['complete'] / row['total'] * 100) if row['total'] > 0 else 0
-                })
-
-            return results
+        Only the requested page of rows is copied.
 
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting directory statistics: {str(e)}",
-                "Metadata Manager",
-                Qgis.Warning
-            )
+        Args:
+            section: Key in the get_all_statistics() result
+            limit: Maximum number of rows, or None for all
+            offset: Number of leading rows to skip
+
+        Returns:
+            List of dictionaries or None on error
+        """
+        stats = self.get_all_statistics()
+        if stats is None:
             return None
+        end = None if limit is None else offset + limit
+        return [dict(row) for row in stats[section][offset:end]]
 
-    def get_statistics_by_data_type(self) -> Optional[List[Dict]]:
+    def get_inventory_statistics(self) -> Optional[Dict[str, int]]:
         """
-        Get metadata completion statistics grouped by data type.
+        Get metadata completion statistics from inventory.
 
         Returns:
-            List of dictionaries with data type stats or None on error
+            Dictionary with statistics or None on error
         """
-        if not self.is_connected:
+        stats = self.get_all_statistics()
+        if stats is None:
             return None
+        return dict(stats['summary'])
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT
-                    data_type,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN metadata_status = 'complete' THEN 1 ELSE 0 END) as complete,
-                    SUM(CASE WHEN metadata_status = 'partial' THEN 1 ELSE 0 END) as partial,
-                    SUM(CASE WHEN metadata_status IS NULL OR metadata_status = 'none' THEN 1 ELSE 0 END) as none
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                GROUP BY data_type
-                ORDER BY total DESC
-            """)
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'data_type': row['data_type'] or 'Unknown',
-                    'total': row['total'],
-                    'complete': row['complete'],
-                    'partial': row['partial'],
-                    'none': row['none'],
-                    'completion_pct': (row['complete'] / row['total'] * 100) if row['total'] > 0 else 0
-                })
-
-            return results
+    def get_statistics_by_directory(self, limit: Optional[int] = None,
+                                    offset: int = 0) -> Optional[List[Dict]]:
+        """
+        Get metadata completion statistics grouped by directory.
 
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting data type statistics: {str(e)}",
-                "Metadata Manager",
-                Qgis.Warning
-            )
-            return None
+        Args:
+            limit: Maximum number of rows (largest groups first), or None for all
+            offset: Number of leading rows to skip
 
-    def get_statistics_by_file_format(self) -> Optional[List[Dict]]:
+        Returns:
+            List of dictionaries with directory stats or None on error
         """
-        Get metadata completion statistics grouped by file format.
+        return self._get_statistics_section('by_directory', limit, offset)
+
+    def get_statistics_by_data_type(self, limit: Optional[int] = None,
+                                    offset: int = 0) -> Optional[List[Dict]]:
+        """
+        Get metadata completion statistics grouped by data type.
+
+        Args:
+            limit: Maximum number of rows (largest groups first), or None for all
+            offset: Number of leading rows to skip
 
         Returns:
-            List of dictionaries with file format stats or None on error
+            List of dictionaries with data type stats or None on error
         """
-        if not self.is_connected:
-            return None
+        return self._get_statistics_section('by_data_type', limit, offset)
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT
-                    format,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN metadata_status = 'complete' THEN 1 ELSE 0 END) as complete,
-                    SUM(CASE WHEN metadata_status = 'partial' THEN 1 ELSE 0 END) as partial,
-                    SUM(CASE WHEN metadata_status IS NULL OR metadata_status = 'none' THEN 1 ELSE 0 END) as none
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                GROUP BY format
-                ORDER BY total DESC
-            """)
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'file_format': row['format'] or 'Unknown',
-                    'total': row['total'],
-                    'complete': row['complete'],
-                    'partial': row['partial'],
-                    'none': row['none'],
-                    'completion_pct': (row['complete'] / row['total'] * 100) if row['total'] > 0 else 0
-                })
-
-            return results
+    def get_statistics_by_file_format(self, limit: Optional[int] = None,
+                                      offset: int = 0) -> Optional[List[Dict]]:
+        """
+        Get metadata completion statistics grouped by file format.
 
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting file format statistics: {str(e)}",
-                "Metadata Manager",
-                Qgis.Warning
-            )
-            return None
+        Args:
+            limit: Maximum number of rows (largest groups first), or None for all
+            offset: Number of leading rows to skip
+
+        Returns:
+            List of dictionaries with file format stats or None on error
+        """
+        return self._get_statistics_section('by_file_format', limit, offset)
 
-    def get_statistics_by_crs(self) -> Optional[List[Dict]]:
+    def get_statistics_by_crs(self, limit: Optional[int] = None,
+                              offset: int = 0) -> Optional[List[Dict]]:
         """
         Get metadata completion statistics grouped by CRS.
 
+        Args:
+            limit: Maximum number of rows (largest groups first), or None for all
+            offset: Number of leading rows to skip
+
         Returns:
             List of dictionaries with CRS stats or None on error
         """
-        if not self.is_connected:
-            return None
+        return self._get_statistics_section('by_crs', limit, offset)
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT
-                    crs_authid,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN metadata_status = 'complete' THEN 1 ELSE 0 END) as complete,
-                    SUM(CASE WHEN metadata_status = 'partial' THEN 1 ELSE 0 END) as partial,
-                    SUM(CASE WHEN metadata_status IS NULL OR metadata_status = 'none' THEN 1 ELSE 0 END) as none
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                GROUP BY crs_authid
-                ORDER BY total DESC
-            """)
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'crs': row['crs_authid'] or 'Unknown',
-                    'total': row['total'],
-                    'complete': row['complete'],
-                    'partial': row['partial'],
-                    'none': row['none'],
-                    'completion_pct': (row['complete'] / row['total'] * 100) if row['total'] > 0 else 0
-                })
-
-            return results
-
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting CRS statistics: {str(e)}",
-                "Metadata Manager",
-                Qgis.Warning
-            )
-            return None
-
-    def get_priority_recommendations(self, limit: int = 5) -> Optional[List[Dict]]:
+    def get_priority_recommendations(self, limit: int = 5, offset: int = 0) -> Optional[List[Dict]]:
         """
         Get priority recommendations for metadata completion.
 
@@ -637,48 +1402,25 @@ class DatabaseManager:
 
         Args:
             limit: Maximum number of recommendations
+            offset: Number of leading recommendations to skip
 
         Returns:
             List of dictionaries with recommendations or None on error
         """
-        if not self.is_connected:
+        stats = self.get_all_statistics()
+        if stats is None:
             return None
 
-        try:
-            cursor = self.connection.cursor()
-
-            # Get directories with most layers lacking metadata
-            cursor.execute("""
-                SELECT
-                    parent_directory,
-                    format,
-                    COUNT(*) as count
-                FROM geospatial_inventory
-                WHERE retired_datetime IS NULL
-                  AND (metadata_status IS NULL OR metadata_status = 'none')
-                GROUP BY parent_directory, format
-                ORDER BY count DESC
-                LIMIT ?
-            """, (limit,))
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'directory': row['parent_directory'] or 'Root',
-                    'file_format': row['format'] or 'Unknown',
-                    'count': row['count'],
-                    'recommendation': f"{row['count']} {row['format'] or 'files'} in {row['parent_directory'] or 'Root'} need metadata"
-                })
-
-            return results
+        results = []
+        for directory, file_format, count in stats['recommendations'][offset:offset + limit]:
+            results.append({
+                'directory': directory or 'Root',
+                'file_format': file_format or 'Unknown',
+                'count': count,
+                'recommendation': f"{count} {file_format or 'files'} in {directory or 'Root'} need metadata"
+            })
 
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting recommendations: {str(e)}",
-                "Metadata Manager",
-                Qgis.Warning
-            )
-            return None
+        return results
 
     def save_metadata_to_cache(self, layer_path: str, layer_name: str, metadata: Dict, in_sync: bool = False) -> bool:
         """
@@ -699,40 +1441,29 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
 
-            # Convert metadata dict to JSON
-            metadata_json = json.dumps(metadata, indent=2)
+            # Convert metadata dict to compact JSON (machine storage only)
+            metadata_json = _dump_metadata_json(metadata)
 
-            # Insert or replace metadata cache entry
+            # Insert or update metadata cache entry, keeping created_date
             # Use both layer_path AND layer_name to uniquely identify layers
             cursor.execute(
-                """
-                INSERT OR REPLACE INTO metadata_cache (
-                    layer_path,
-                    layer_name,
-                    metadata_json,
-                    created_date,
-                    last_edited_date,
-                    in_sync
-                ) VALUES (?, ?, ?,
-                    COALESCE((SELECT created_date FROM metadata_cache WHERE layer_path = ? AND layer_name = ?), datetime('now')),
-                    datetime('now'),
-                    ?
-                )
-                """,
-                (layer_path, layer_name, metadata_json, layer_path, layer_name, 1 if in_sync else 0)
+                SQL_SAVE_METADATA_CACHE,
+                (layer_path, layer_name, metadata_json, 1 if in_sync else 0)
             )
+            self._forget_cached_metadata(layer_path, layer_name)
 
-            self.connection.commit()
+            self._commit()
 
-            QgsMessageLog.logMessage(
-                f"Metadata cached for: {layer_path} / {layer_name}",
-                "Metadata Manager",
-                Qgis.Info
-            )
+            if self._log_info:
+                QgsMessageLog.logMessage(
+                    f"Metadata cached for: {layer_path} / {layer_name}",
+                    "Metadata Manager",
+                    Qgis.Info
+                )
             return True
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Error saving metadata to cache: {str(e)}",
                 "Metadata Manager",
@@ -755,29 +1486,43 @@ class DatabaseManager:
             return None
 
         try:
+            # Entries stay valid until another connection commits; writes
+            # through this manager invalidate their own keys
+            data_version = self.connection.execute(SQL_DATA_VERSION).fetchone()[0]
+            if data_version != self._metadata_lru_version:
+                self._metadata_lru.clear()
+                self._metadata_lru_version = data_version
+
+            key = (layer_path, layer_name or None)
+            metadata_json = self._metadata_lru.get(key)
+            if metadata_json is not None:
+                self._metadata_lru.move_to_end(key)
+                return json.loads(metadata_json)
+
             cursor = self.connection.cursor()
 
             # Use both layer_path and layer_name to uniquely identify layers
             if layer_name:
-                cursor.execute(
-                    "SELECT metadata_json FROM metadata_cache WHERE layer_path = ? AND layer_name = ?",
-                    (layer_path, layer_name)
-                )
+                cursor.execute(SQL_LOAD_CACHE_WITH_LAYER, (layer_path, layer_name))
             else:
                 # Fallback for backward compatibility if layer_name not provided
-                cursor.execute(
-                    "SELECT metadata_json FROM metadata_cache WHERE layer_path = ?",
-                    (layer_path,)
-                )
+                cursor.execute(SQL_LOAD_CACHE_NO_LAYER, (layer_path,))
 
             row = cursor.fetchone()
             if row:
-                metadata = json.loads(row['metadata_json'])
-                QgsMessageLog.logMessage(
-                    f"Metadata loaded from cache: {layer_path}" + (f" / {layer_name}" if layer_name else ""),
-                    "Metadata Manager",
-                    Qgis.Info
-                )
+                metadata_json = row[0]
+                metadata = json.loads(metadata_json)
+
+                self._metadata_lru[key] = metadata_json
+                if len(self._metadata_lru) > self.METADATA_LRU_SIZE:
+                    self._metadata_lru.popitem(last=False)
+
+                if self._log_info:
+                    QgsMessageLog.logMessage(
+                        f"Metadata loaded from cache: {layer_path}" + (f" / {layer_name}" if layer_name else ""),
+                        "Metadata Manager",
+                        Qgis.Info
+                    )
                 return metadata
             else:
                 return None
@@ -790,6 +1535,18 @@ class DatabaseManager:
             )
             return None
 
+    def _forget_cached_metadata(self, layer_path: str, layer_name: Optional[str]):
+        """
+        Drop in-memory copies of a layer's cached metadata before it changes.
+
+        Args:
+            layer_path: Full path to the layer file
+            layer_name: Name of the layer
+        """
+        self._metadata_lru.pop((layer_path, layer_name or None), None)
+        # Path-only lookups may have returned this layer's row
+        self._metadata_lru.pop((layer_path, None), None)
+
     def update_inventory_metadata_status(
         self,
         layer_path: str,
@@ -814,56 +1571,80 @@ class DatabaseManager:
         if not self.is_connected:
             return False
 
+        updated = self.update_inventory_metadata_status_many(
+            [(layer_path, layer_name, status, target, cached)]
+        )
+
+        if updated > 0:
+            QgsMessageLog.logMessage(
+                f"✅ Inventory updated: {layer_path} / {layer_name} → status={status}",
+                "Metadata Manager",
+                Qgis.Success
+            )
+            return True
+        elif updated < 0:
+            return False
+
+        try:
+            # Try to find similar layers for debugging
+            cursor = self.connection.cursor()
+            cursor.execute(SQL_LAYERS_FOR_PATH, (layer_path,))
+            similar = [f"{file_path} / {name}" for file_path, name in cursor.fetchall()]
+        except Exception:
+            similar = []
+        QgsMessageLog.logMessage(
+            f"⚠ Layer not found in inventory: {layer_path} / {layer_name}\n"
+            f"Layers with same file_path: {similar[:3] if similar else 'none found'}",
+            "Metadata Manager",
+            Qgis.Warning
+        )
+        return False
+
+    def update_inventory_metadata_status_many(
+        self,
+        rows: Iterable[Tuple[str, str, str, str, bool]]
+    ) -> int:
+        """
+        Update metadata tracking fields for several inventory layers at once.
+
+        All updates run in one transaction with a single commit and record
+        the same metadata_last_updated timestamp.
+
+        Args:
+            rows: Iterable of (layer_path, layer_name, status, target, cached)
+
+        Returns:
+            Number of inventory rows updated, or -1 on error
+        """
+        if not self.is_connected:
+            return -1
+
         try:
+            updated_at = _sqlite_now()
             cursor = self.connection.cursor()
+            self._begin()
 
             # Match both file_path AND layer_name to uniquely identify the layer
             # This prevents updating all layers in a container file
-            cursor.execute(
-                """
-                UPDATE geospatial_inventory
-                SET
-                    metadata_status = ?,
-                    metadata_last_updated = datetime('now'),
-                    metadata_target = ?,
-                    metadata_cached = ?
-                WHERE file_path = ? AND layer_name = ?
-                """,
-                (status, target, 1 if cached else 0, layer_path, layer_name)
+            cursor.executemany(
+                SQL_UPDATE_INVENTORY_STATUS,
+                (
+                    (status, updated_at, target, 1 if cached else 0, layer_path, layer_name)
+                    for layer_path, layer_name, status, target, cached in rows
+                )
             )
 
-            self.connection.commit()
-
-            if cursor.rowcount > 0:
-                QgsMessageLog.logMessage(
-                    f"✅ Inventory updated: {layer_path} / {layer_name} → status={status}",
-                    "Metadata Manager",
-                    Qgis.Success
-                )
-                return True
-            else:
-                # Try to find similar layers for debugging
-                cursor.execute(
-                    "SELECT file_path, layer_name FROM geospatial_inventory WHERE file_path = ? LIMIT 5",
-                    (layer_path,)
-                )
-                similar = [f"{row['file_path']} / {row['layer_name']}" for row in cursor.fetchall()]
-                QgsMessageLog.logMessage(
-                    f"⚠ Layer not found in inventory: {layer_path} / {layer_name}\n"
-                    f"Layers with same file_path: {similar[:3] if similar else 'none found'}",
-                    "Metadata Manager",
-                    Qgis.Warning
-                )
-                return False
+            self._commit()
+            return cursor.rowcount
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Error updating inventory: {str(e)}",
                 "Metadata Manager",
                 Qgis.Critical
             )
-            return False
+            return -1
 
     def fix_incorrect_metadata_status(self) -> tuple[bool, str]:
         """
@@ -881,46 +1662,26 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
 
-            # First, check how many layers need fixing
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM geospatial_inventory
-                WHERE metadata_status = 'complete'
-                AND NOT EXISTS (
-                    SELECT 1 FROM metadata_cache
-                    WHERE metadata_cache.layer_path = geospatial_inventory.file_path
-                    AND metadata_cache.layer_name = geospatial_inventory.layer_name
-                )
-            """)
-
-            incorrect_count = cursor.fetchone()[0]
-
-            if incorrect_count == 0:
+            # Usually nothing needs fixing; a read-only probe answers that
+            # without taking the write lock an UPDATE would wait for
+            cursor.execute(SQL_HAS_INCORRECT_STATUS)
+            if not cursor.fetchone()[0]:
                 return True, "No incorrect metadata status found. Database is correct."
 
-            QgsMessageLog.logMessage(
-                f"Found {incorrect_count} layers incorrectly marked as 'complete'",
-                "Metadata Manager",
-                Qgis.Info
+            # Fix the incorrect status in one pass: an anti-join that walks
+            # the status index and probes the (layer_path, layer_name) index
+            cursor.execute(
+                SQL_FIX_INCORRECT_STATUS_FROM if _HAS_UPDATE_FROM else SQL_FIX_INCORRECT_STATUS,
+                (_sqlite_now(),)
             )
+            fixed_count = cursor.rowcount
 
-            # Fix the incorrect status
-            cursor.execute("""
-                UPDATE geospatial_inventory
-                SET metadata_status = 'none',
-                    metadata_cached = 0,
-                    metadata_last_updated = datetime('now')
-                WHERE metadata_status = 'complete'
-                AND NOT EXISTS (
-                    SELECT 1 FROM metadata_cache
-                    WHERE metadata_cache.layer_path = geospatial_inventory.file_path
-                    AND metadata_cache.layer_name = geospatial_inventory.layer_name
-                )
-            """)
+            self._commit()
 
-            self.connection.commit()
+            if fixed_count == 0:
+                return True, "No incorrect metadata status found. Database is correct."
 
-            message = f"Fixed {cursor.rowcount} layers that were incorrectly marked as 'complete'"
+            message = f"Fixed {fixed_count} layers that were incorrectly marked as 'complete'"
 
             QgsMessageLog.logMessage(
                 message,
@@ -931,7 +1692,7 @@ class DatabaseManager:
             return True, message
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             error_msg = f"Error fixing metadata status: {str(e)}"
             QgsMessageLog.logMessage(
                 error_msg,
@@ -962,45 +1723,67 @@ class DatabaseManager:
         if not self.is_connected:
             return False
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                UPDATE metadata_cache
-                SET
-                    last_written_date = datetime('now'),
-                    target_location = ?,
-                    in_sync = ?
-                WHERE layer_path = ? AND layer_name = ?
-                """,
-                (target_location, 1 if in_sync else 0, layer_path, layer_name)
+        updated = self.update_metadata_write_status_many(
+            [(layer_path, layer_name, target_location, in_sync)]
+        )
+
+        if updated > 0:
+            QgsMessageLog.logMessage(
+                f"Metadata write status updated: {layer_path} / {layer_name}",
+                "Metadata Manager",
+                Qgis.Success
+            )
+            return True
+        elif updated == 0:
+            QgsMessageLog.logMessage(
+                f"No metadata cache entry found to update: {layer_path} / {layer_name}",
+                "Metadata Manager",
+                Qgis.Warning
             )
+        return False
 
-            self.connection.commit()
+    def update_metadata_write_status_many(
+        self,
+        rows: Iterable[Tuple[str, str, str, bool]]
+    ) -> int:
+        """
+        Update the write status of several metadata_cache entries at once.
 
-            if cursor.rowcount > 0:
-                QgsMessageLog.logMessage(
-                    f"Metadata write status updated: {layer_path} / {layer_name}",
-                    "Metadata Manager",
-                    Qgis.Success
-                )
-                return True
-            else:
-                QgsMessageLog.logMessage(
-                    f"No metadata cache entry found to update: {layer_path} / {layer_name}",
-                    "Metadata Manager",
-                    Qgis.Warning
+        All updates run in one transaction with a single commit and record
+        the same last_written_date, taken when the batch starts.
+
+        Args:
+            rows: Iterable of (layer_path, layer_name, target_location, in_sync)
+
+        Returns:
+            Number of cache entries updated, or -1 on error
+        """
+        if not self.is_connected:
+            return -1
+
+        try:
+            written_at = _sqlite_now()
+            cursor = self.connection.cursor()
+            self._begin()
+            cursor.executemany(
+                SQL_UPDATE_WRITE_STATUS,
+                (
+                    (written_at, target_location, 1 if in_sync else 0, layer_path, layer_name)
+                    for layer_path, layer_name, target_location, in_sync in rows
                 )
-                return False
+            )
+
+            self._commit()
+            return cursor.rowcount
 
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             QgsMessageLog.logMessage(
                 f"Error updating metadata write status: {str(e)}",
                 "Metadata Manager",
                 Qgis.Critical
             )
-            return False
+            return -1
 
     def get_smart_defaults(self, layer_path: str, layer_name: str) -> Optional[Dict]:
         """
@@ -1015,6 +1798,10 @@ class DatabaseManager:
         - File metadata (creation date, format, etc.)
         - Existing GIS metadata if available
 
+        Callers that only need the wizard fields should use
+        get_smart_defaults_core() and fetch the rest with
+        get_smart_defaults_extras() when required.
+
         Args:
             layer_path: Full path to the layer file
             layer_name: Name of the layer
@@ -1022,114 +1809,88 @@ class DatabaseManager:
         Returns:
             Dictionary with smart default values or None on error
         """
-        if not self.is_connected:
-            return None
+        return self._get_layer_smart_defaults(layer_path, layer_name, SMART_DEFAULTS_COLUMNS)
 
-        try:
-            cursor = self.connection.cursor()
+    def get_smart_defaults_core(self, layer_path: str, layer_name: str) -> Optional[Dict]:
+        """
+        Get the smart defaults used by the metadata wizard on first load.
 
-            # Query comprehensive metadata from inventory
-            cursor.execute(
-                """
-                SELECT
-                    layer_name,
-                    file_path,
-                    format,
-                    data_type,
-                    crs_authid,
-                    native_extent,
-                    wgs84_extent,
-                    geometry_type,
-                    feature_count,
-                    field_names,
-                    field_types,
-                    band_count,
-                    raster_width,
-                    raster_height,
-                    pixel_width,
-                    pixel_height,
-                    nodata_value,
-                    data_types,
-                    file_created,
-                    file_modified,
-                    file_size_mb,
-                    layer_title,
-                    layer_abstract,
-                    keywords,
-                    lineage,
-                    constraints,
-                    url,
-                    contact_info,
-                    parent_directory
-                FROM geospatial_inventory
-                WHERE file_path = ? AND layer_name = ? AND retired_datetime IS NULL
-                """,
-                (layer_path, layer_name)
-            )
+        Reads only SMART_DEFAULTS_CORE_COLUMNS: title, abstract, keywords,
+        lineage, constraints, geometry/feature information, fields and
+        raster dimensions.
 
-            row = cursor.fetchone()
+        Args:
+            layer_path: Full path to the layer file
+            layer_name: Name of the layer
 
-            if not row:
-                QgsMessageLog.logMessage(
-                    f"Layer not found in inventory: {layer_path} / {layer_name}",
-                    "Metadata Manager",
-                    Qgis.Warning
-                )
-                return None
+        Returns:
+            Dictionary with core smart default values or None on error
+        """
+        return self._get_layer_smart_defaults(layer_path, layer_name, SMART_DEFAULTS_CORE_COLUMNS)
 
-            # Convert layer name to Title Case for title
-            title = self._convert_to_title_case(row['layer_name'])
+    def get_smart_defaults_extras(self, layer_path: str, layer_name: str) -> Optional[Dict]:
+        """
+        Get the smart defaults not returned by get_smart_defaults_core().
 
-            # Build smart defaults dictionary
-            defaults = {
-                # Essential fields
-                'title': row['layer_title'] or title,  # Use existing title or generate
-                'abstract': row['layer_abstract'] or '',
-                'keywords': row['keywords'].split(',') if row['keywords'] else [],
+        Covers CRS and extents, pixel height, nodata and band data types,
+        file details (format, dates, size, directory), URL and contact info.
 
-                # Spatial information
-                'crs': row['crs_authid'] or '',
-                'native_extent': row['native_extent'],  # Format: "xmin,ymin,xmax,ymax"
-                'wgs84_extent': row['wgs84_extent'],
+        Args:
+            layer_path: Full path to the layer file
+            layer_name: Name of the layer
 
-                # Data type specific
-                'data_type': row['data_type'] or 'dataset',
-                'geometry_type': row['geometry_type'] or '',
-                'feature_count': row['feature_count'],
-                'field_names': row['field_names'].split(',') if row['field_names'] else [],
-                'field_types': row['field_types'].split(',') if row['field_types'] else [],
+        Returns:
+            Dictionary with the remaining smart default values or None on error
+        """
+        return self._get_layer_smart_defaults(layer_path, layer_name, SMART_DEFAULTS_EXTRA_COLUMNS)
 
-                # Raster specific
-                'band_count': row['band_count'],
-                'raster_width': row['raster_width'],
-                'raster_height': row['raster_height'],
-                'pixel_width': row['pixel_width'],
-                'pixel_height': row['pixel_height'],
-                'nodata_value': row['nodata_value'],
-                'data_types': row['data_types'],
+    def _get_layer_smart_defaults(
+        self,
+        layer_path: str,
+        layer_name: str,
+        columns: Tuple[str, ...]
+    ) -> Optional[Dict]:
+        """
+        Look up the smart defaults for one layer, logging misses.
 
-                # File metadata
-                'format': row['format'] or '',
-                'file_path': row['file_path'],
-                'file_created': row['file_created'],
-                'file_modified': row['file_modified'],
-                'file_size_mb': row['file_size_mb'],
-                'parent_directory': row['parent_directory'],
+        Args:
+            layer_path: Full path to the layer file
+            layer_name: Name of the layer
+            columns: SMART_DEFAULTS_CORE_COLUMNS, SMART_DEFAULTS_EXTRA_COLUMNS
+                or SMART_DEFAULTS_COLUMNS
 
-                # Existing GIS metadata
-                'lineage': row['lineage'] or '',
-                'constraints': row['constraints'] or '',
-                'url': row['url'] or '',
-                'contact_info': row['contact_info'] or ''
-            }
+        Returns:
+            Dictionary with smart default values or None if not found or on error
+        """
+        if not self.is_connected:
+            return None
 
-            QgsMessageLog.logMessage(
-                f"Loaded smart defaults for: {layer_name} ({title})",
-                "Metadata Manager",
-                Qgis.Info
-            )
+        with_core = columns is not SMART_DEFAULTS_EXTRA_COLUMNS
+        with_extras = columns is not SMART_DEFAULTS_CORE_COLUMNS
+        key = (layer_path, layer_name, with_core, with_extras)
 
-            return defaults
+        try:
+            # Inventory rows only change through rescans (other connections)
+            # or execute_update(), so entries live until data_version moves
+            data_version = self.connection.execute(SQL_DATA_VERSION).fetchone()[0]
+            if data_version != self._defaults_lru_version:
+                self._defaults_lru.clear()
+                self._defaults_lru_version = data_version
+
+            defaults = self._defaults_lru.get(key)
+            if defaults is not None:
+                self._defaults_lru.move_to_end(key)
+                defaults = _copy_smart_defaults(defaults)
+            else:
+                # Query metadata from inventory
+                values = self.connection.execute(
+                    _smart_defaults_sql(columns), (layer_path, layer_name)
+                ).fetchone()
+                if values is not None:
+                    defaults = self._build_smart_defaults(values, with_core, with_extras)
+                    self._defaults_lru[key] = _copy_smart_defaults(defaults)
+                    if len(self._defaults_lru) > self.SMART_DEFAULTS_LRU_SIZE:
+                        self._defaults_lru.popitem(last=False)
 
         except Exception as e:
             QgsMessageLog.logMessage(
@@ -1139,6 +1900,106 @@ class DatabaseManager:
             )
             return None
 
+        if defaults is None:
+            QgsMessageLog.logMessage(
+                f"Layer not found in inventory: {layer_path} / {layer_name}",
+                "Metadata Manager",
+                Qgis.Warning
+            )
+            return None
+
+        if self._log_info:
+            QgsMessageLog.logMessage(
+                f"Loaded smart defaults for: {layer_name} ({defaults.get('title', layer_name)})",
+                "Metadata Manager",
+                Qgis.Info
+            )
+        return defaults
+
+    def _build_smart_defaults(self, values: tuple, with_core: bool, with_extras: bool) -> Dict:
+        """
+        Build the smart defaults dictionary from one inventory row.
+
+        The row is unpacked positionally in SMART_DEFAULTS_COLUMNS order:
+        key columns, then the core group and/or the extras group.
+
+        Args:
+            values: Row tuple as selected by _smart_defaults_sql()
+            with_core: Row includes SMART_DEFAULTS_CORE_COLUMNS
+            with_extras: Row includes SMART_DEFAULTS_EXTRA_COLUMNS
+
+        Returns:
+            Dictionary with smart default values
+        """
+        defaults = {}
+
+        if with_core:
+            (layer_name, file_path, layer_title, layer_abstract, keywords,
+             lineage, constraints, geometry_type, feature_count, field_names,
+             field_types, band_count, raster_width, raster_height,
+             pixel_width) = values[:len(SMART_DEFAULTS_CORE_COLUMNS)]
+
+            defaults.update({
+                # Essential fields; use existing title or generate one
+                # from the layer name in Title Case
+                'title': layer_title or self._convert_to_title_case(layer_name),
+                'abstract': layer_abstract or '',
+                'keywords': _parse_list_column(keywords),
+
+                # Data type specific
+                'geometry_type': geometry_type or '',
+                'feature_count': feature_count,
+                'field_names': _parse_list_column(field_names),
+                'field_types': _parse_list_column(field_types),
+
+                # Raster specific
+                'band_count': band_count,
+                'raster_width': raster_width,
+                'raster_height': raster_height,
+                'pixel_width': pixel_width,
+
+                # Existing GIS metadata
+                'lineage': lineage or '',
+                'constraints': constraints or '',
+            })
+
+        if with_extras:
+            # The extras group is the tail of both extras-only and full rows
+            file_path = values[1]
+            (fmt, data_type, crs_authid, native_extent, wgs84_extent,
+             pixel_height, nodata_value, data_types, file_created,
+             file_modified, file_size_mb, url, contact_info,
+             parent_directory) = values[-_SMART_DEFAULTS_EXTRA_COUNT:]
+
+            defaults.update({
+                # Spatial information
+                'crs': crs_authid or '',
+                'native_extent': native_extent,  # Format: "xmin,ymin,xmax,ymax"
+                'wgs84_extent': wgs84_extent,
+
+                # Data type specific
+                'data_type': data_type or 'dataset',
+
+                # Raster specific
+                'pixel_height': pixel_height,
+                'nodata_value': nodata_value,
+                'data_types': data_types,
+
+                # File metadata
+                'format': fmt or '',
+                'file_path': file_path,
+                'file_created': file_created,
+                'file_modified': file_modified,
+                'file_size_mb': file_size_mb,
+                'parent_directory': parent_directory,
+
+                # Existing GIS metadata
+                'url': url or '',
+                'contact_info': contact_info or ''
+            })
+
+        return defaults
+
     def _convert_to_title_case(self, layer_name: str) -> str:
         """
         Convert layer name to Title Case for use as metadata title.
@@ -1157,38 +2018,26 @@ class DatabaseManager:
         if not layer_name:
             return "Untitled Layer"
 
-        # Replace underscores and hyphens with spaces
-        title = layer_name.replace('_', ' ').replace('-', ' ')
-
-        # Remove common file extensions
-        extensions = ['.shp', '.tif', '.tiff', '.gpkg', '.geojson', '.kml', '.gml']
-        for ext in extensions:
-            if title.lower().endswith(ext):
-                title = title[:-len(ext)]
-
-        # Convert to title case
-        title = title.title()
-
-        # Fix common abbreviations that should be uppercase
-        abbreviations = {
-            'Usa': 'USA', 'Us': 'US', 'Uk': 'UK',
-            'Dem': 'DEM', 'Dsm': 'DSM', 'Dtm': 'DTM',
-            'Gps': 'GPS', 'Gis': 'GIS', 'Crs': 'CRS',
-            'Utm': 'UTM', 'Wgs': 'WGS', 'Nad': 'NAD',
-            'Id': 'ID', 'Url': 'URL', 'Api': 'API'
-        }
-
-        words = title.split()
-        for i, word in enumerate(words):
-            if word in abbreviations:
-                words[i] = abbreviations[word]
-
-        return ' '.join(words)
+        return _layer_name_to_title(layer_name)
 
     def __enter__(self):
-        """Context manager entry."""
+        """
+        Context manager entry.
+
+        Connects to db_path if it was given and no connection is open yet.
+        """
+        self._with_opened.append(self.connection is None)
+        if self.connection is None and self.db_path:
+            self.connect(self.db_path)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.disconnect()
+        """
+        Context manager exit.
+
+        Disconnects only if the connection was opened by this block, so using
+        the plugin's shared, already connected manager in a with statement
+        does not close it for the other panels.
+        """
+        if self._with_opened.pop():
+            self.disconnect()
@@ -9,18 +9,200 @@ Author: John Zastrow
 License: MIT
 """
 
-__version__ = "0.1.0"
+__version__ = "0.2.0"
 
 import os
-from typing import Dict, Tuple, Optional
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Set, Tuple, Optional
 from qgis.core import (
     QgsLayerMetadata,
     QgsVectorLayer,
     QgsRasterLayer,
-    QgsProviderRegistry,
+    QgsCoordinateReferenceSystem,
+    QgsBox3d,
+    QgsDateTimeRange,
     QgsMessageLog,
     Qgis
 )
+from qgis.PyQt.QtCore import QDateTime, QFile, QIODevice, QTextStream
+from qgis.PyQt.QtXml import QDomDocument
+
+
+# Attributes copied from contact and link dictionaries when present
+_CONTACT_FIELDS = ('name', 'organization', 'position', 'email', 'role', 'voice', 'fax')
+_LINK_FIELDS = ('name', 'type', 'url', 'description', 'format', 'mimeType', 'size')
+
+
+# Container formats whose sidecar is named after the layer, not the file
+_CONTAINER_EXTS = frozenset({'.gpkg', '.sqlite', '.db'})
+
+# Format name fragments that identify a GeoPackage
+_GPKG_TOKENS = ('gpkg', 'geopackage')
+
+
+def _is_geopackage(layer_path: str, file_format: Optional[str]) -> bool:
+    """Check whether a layer is stored in a GeoPackage (embedded metadata)."""
+    if layer_path[-5:].lower() == '.gpkg':
+        return True
+    if not file_format:
+        return False
+    format_lower = file_format.lower()
+    return any(token in format_lower for token in _GPKG_TOKENS)
+
+
+@lru_cache(maxsize=256)
+def _crs_from_string(definition: str) -> QgsCoordinateReferenceSystem:
+    """Build a CRS once per distinct definition string (e.g. 'EPSG:4326')."""
+    return QgsCoordinateReferenceSystem(definition)
+
+
+def _to_crs(value) -> QgsCoordinateReferenceSystem:
+    """Convert a metadata CRS value, reusing parsed CRSs for strings."""
+    if isinstance(value, str):
+        return _crs_from_string(value)
+    return QgsCoordinateReferenceSystem(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_qdate(value: str) -> QDateTime:
+    """Parse a 'yyyy-MM-dd' temporal extent date once per distinct string."""
+    return QDateTime.fromString(value, 'yyyy-MM-dd')
+
+
+def _fill_fields(item, values: Dict, fields: Tuple[str, ...]):
+    """Copy the given keys that are present in values onto item's attributes."""
+    for field in fields:
+        if field in values:
+            setattr(item, field, values[field])
+    return item
+
+
+# Handlers for metadata dictionary keys. Each is called with the
+# QgsLayerMetadata being built and the key's value (never None).
+
+def _call_setter(setter: str, metadata: QgsLayerMetadata, value):
+    """Pass the value to a plain setter (title, abstract, ...)."""
+    getattr(metadata, setter)(value)
+
+
+def _call_list_setter(setter: str, metadata: QgsLayerMetadata, value):
+    """Pass the value to a setter if it is a list (categories, rights, ...)."""
+    if isinstance(value, list):
+        getattr(metadata, setter)(value)
+
+
+def _apply_keywords(metadata: QgsLayerMetadata, keywords):
+    """Keywords can be a list of strings or dict with vocabulary."""
+    if isinstance(keywords, list):
+        metadata.setKeywords({'keywords': keywords})
+    elif isinstance(keywords, dict):
+        metadata.setKeywords(keywords)
+
+
+def _apply_contacts(metadata: QgsLayerMetadata, contacts):
+    """Set contacts from a list of contact dictionaries."""
+    if isinstance(contacts, list):
+        metadata.setContacts([
+            _fill_fields(QgsLayerMetadata.Contact(), contact_dict, _CONTACT_FIELDS)
+            for contact_dict in contacts
+        ])
+
+
+def _apply_links(metadata: QgsLayerMetadata, links):
+    """Set links from a list of link dictionaries."""
+    if isinstance(links, list):
+        metadata.setLinks([
+            _fill_fields(QgsLayerMetadata.Link(), link_dict, _LINK_FIELDS)
+            for link_dict in links
+        ])
+
+
+def _apply_crs(metadata: QgsLayerMetadata, crs):
+    """Set the layer CRS."""
+    metadata.setCrs(_to_crs(crs))
+
+
+def _apply_extent(metadata: QgsLayerMetadata, extent_dict):
+    """Set spatial and temporal extents."""
+    extent = QgsLayerMetadata.Extent()
+
+    # Spatial extent
+    if 'spatial' in extent_dict and isinstance(extent_dict['spatial'], list):
+        spatial_extents = []
+        for spatial_dict in extent_dict['spatial']:
+            spatial = QgsLayerMetadata.SpatialExtent()
+            if 'extentCrs' in spatial_dict:
+                spatial.extentCrs = _to_crs(spatial_dict['extentCrs'])
+            if 'bounds' in spatial_dict:
+                bounds = spatial_dict['bounds']
+                if isinstance(bounds, dict) and 'xMinimum' in bounds:
+                    spatial.bounds = QgsBox3d(
+                        bounds.get('xMinimum', 0),
+                        bounds.get('yMinimum', 0),
+                        bounds.get('zMinimum', 0),
+                        bounds.get('xMaximum', 0),
+                        bounds.get('yMaximum', 0),
+                        bounds.get('zMaximum', 0)
+                    )
+            spatial_extents.append(spatial)
+        extent.setSpatialExtents(spatial_extents)
+
+    # Temporal extent
+    if 'temporal' in extent_dict and isinstance(extent_dict['temporal'], list):
+        temporal_extents = []
+        for temporal_dict in extent_dict['temporal']:
+            temporal = QgsLayerMetadata.TemporalExtent()
+            if 'begin' in temporal_dict:
+                begin = _parse_qdate(temporal_dict['begin'])
+                end = _parse_qdate(temporal_dict.get('end', temporal_dict['begin']))
+                temporal.range = QgsDateTimeRange(begin, end)
+            temporal_extents.append(temporal)
+        extent.setTemporalExtents(temporal_extents)
+
+    metadata.setExtent(extent)
+
+
+# Every supported key with its handler, in the order they are applied
+_KEY_HANDLERS = (
+    ('title', partial(_call_setter, 'setTitle')),
+    ('abstract', partial(_call_setter, 'setAbstract')),
+    ('type', partial(_call_setter, 'setType')),
+    ('language', partial(_call_setter, 'setLanguage')),
+    ('keywords', _apply_keywords),
+    ('categories', partial(_call_list_setter, 'setCategories')),
+    ('contacts', _apply_contacts),
+    ('links', _apply_links),
+    ('rights', partial(_call_list_setter, 'setRights')),
+    ('licenses', partial(_call_list_setter, 'setLicenses')),
+    ('history', partial(_call_list_setter, 'setHistory')),
+    ('encoding', partial(_call_setter, 'setEncoding')),
+    ('crs', _apply_crs),
+    ('extent', _apply_extent),
+)
+
+_KNOWN_KEYS = frozenset(key for key, _ in _KEY_HANDLERS)
+
+
+def _apply_handlers(handlers: Tuple, metadata_dict: Dict) -> QgsLayerMetadata:
+    """Build a QgsLayerMetadata by running the handlers for present keys."""
+    metadata = QgsLayerMetadata()
+    get = metadata_dict.get
+    for key, handler in handlers:
+        value = get(key)
+        if value is not None:
+            handler(metadata, value)
+    return metadata
+
+
+@lru_cache(maxsize=64)
+def _compile_template(template_keys: FrozenSet[str]) -> Callable[[Dict], QgsLayerMetadata]:
+    """Build a converter that only runs the handlers for template_keys."""
+    handlers = tuple(item for item in _KEY_HANDLERS if item[0] in template_keys)
+    return partial(_apply_handlers, handlers)
 
 
 class MetadataWriter:
@@ -28,7 +210,39 @@ class MetadataWriter:
 
     def __init__(self):
         """Initialize metadata writer."""
-        pass
+        # Directories already created or confirmed by this writer
+        self._known_dirs: Set[str] = set()
+
+        # gpkg_contents data_type per layer, keyed by GeoPackage path
+        self._gpkg_kinds: Dict[str, Dict[str, str]] = {}
+
+        # Successful writes awaiting one combined log message; flushed by
+        # flush_log(), by the single-layer write methods, or when full
+        self._log_buffer: List[str] = []
+        self._log_batch_threshold = 50
+
+    def _log_written(self, targets: List[str]):
+        """
+        Record successful writes for the combined log message.
+
+        Args:
+            targets: Written .qmd paths or 'gpkg / layer' descriptions
+        """
+        self._log_buffer.extend(targets)
+        if len(self._log_buffer) >= self._log_batch_threshold:
+            self.flush_log()
+
+    def flush_log(self):
+        """Log one message for all successful writes recorded so far."""
+        if not self._log_buffer:
+            return
+        if len(self._log_buffer) == 1:
+            message = f"Metadata written to {self._log_buffer[0]}"
+        else:
+            message = (f"Metadata written to {len(self._log_buffer)} targets: "
+                       + ", ".join(self._log_buffer))
+        self._log_buffer = []
+        QgsMessageLog.logMessage(message, "Metadata Manager", Qgis.Success)
 
     def dict_to_qgs_metadata(self, metadata_dict: Dict) -> QgsLayerMetadata:
         """
@@ -40,198 +254,209 @@ class MetadataWriter:
         Returns:
             QgsLayerMetadata object
         """
-        metadata = QgsLayerMetadata()
-
-        # Identification
-        if 'title' in metadata_dict:
-            metadata.setTitle(metadata_dict['title'])
-        if 'abstract' in metadata_dict:
-            metadata.setAbstract(metadata_dict['abstract'])
-        if 'type' in metadata_dict:
-            metadata.setType(metadata_dict['type'])
-        if 'language' in metadata_dict:
-            metadata.setLanguage(metadata_dict['language'])
-
-        # Keywords
-        if 'keywords' in metadata_dict:
-            # Keywords can be a list of strings or dict with vocabulary
-            keywords = metadata_dict['keywords']
-            if isinstance(keywords, list):
-                metadata.setKeywords({'keywords': keywords})
-            elif isinstance(keywords, dict):
-                metadata.setKeywords(keywords)
-
-        # Categories
-        if 'categories' in metadata_dict and isinstance(metadata_dict['categories'], list):
-            metadata.setCategories(metadata_dict['categories'])
-
-        # Contacts
-        if 'contacts' in metadata_dict and isinstance(metadata_dict['contacts'], list):
-            contacts = []
-            for contact_dict in metadata_dict['contacts']:
-                contact = QgsLayerMetadata.Contact()
-                if 'name' in contact_dict:
-                    contact.name = contact_dict['name']
-                if 'organization' in contact_dict:
-                    contact.organization = contact_dict['organization']
-                if 'position' in contact_dict:
-                    contact.position = contact_dict['position']
-                if 'email' in contact_dict:
-                    contact.email = contact_dict['email']
-                if 'role' in contact_dict:
-                    contact.role = contact_dict['role']
-                if 'voice' in contact_dict:
-                    contact.voice = contact_dict['voice']
-                if 'fax' in contact_dict:
-                    contact.fax = contact_dict['fax']
-                contacts.append(contact)
-            metadata.setContacts(contacts)
-
-        # Links
-        if 'links' in metadata_dict and isinstance(metadata_dict['links'], list):
-            links = []
-            for link_dict in metadata_dict['links']:
-                link = QgsLayerMetadata.Link()
-                if 'name' in link_dict:
-                    link.name = link_dict['name']
-                if 'type' in link_dict:
-                    link.type = link_dict['type']
-                if 'url' in link_dict:
-                    link.url = link_dict['url']
-                if 'description' in link_dict:
-                    link.description = link_dict['description']
-                if 'format' in link_dict:
-                    link.format = link_dict['format']
-                if 'mimeType' in link_dict:
-                    link.mimeType = link_dict['mimeType']
-                if 'size' in link_dict:
-                    link.size = link_dict['size']
-                links.append(link)
-            metadata.setLinks(links)
-
-        # Rights
-        if 'rights' in metadata_dict and isinstance(metadata_dict['rights'], list):
-            metadata.setRights(metadata_dict['rights'])
-
-        # Licenses
-        if 'licenses' in metadata_dict and isinstance(metadata_dict['licenses'], list):
-            metadata.setLicenses(metadata_dict['licenses'])
-
-        # History
-        if 'history' in metadata_dict and isinstance(metadata_dict['history'], list):
-            metadata.setHistory(metadata_dict['history'])
-
-        # Encoding
-        if 'encoding' in metadata_dict:
-            metadata.setEncoding(metadata_dict['encoding'])
-
-        # CRS
-        if 'crs' in metadata_dict:
-            from qgis.core import QgsCoordinateReferenceSystem
-            crs = QgsCoordinateReferenceSystem(metadata_dict['crs'])
-            metadata.setCrs(crs)
-
-        # Extent
-        if 'extent' in metadata_dict:
-            extent = QgsLayerMetadata.Extent()
-            extent_dict = metadata_dict['extent']
-
-            # Spatial extent
-            if 'spatial' in extent_dict and isinstance(extent_dict['spatial'], list):
-                spatial_extents = []
-                for spatial_dict in extent_dict['spatial']:
-                    spatial = QgsLayerMetadata.SpatialExtent()
-                    if 'extentCrs' in spatial_dict:
-                        from qgis.core import QgsCoordinateReferenceSystem
-                        spatial.extentCrs = QgsCoordinateReferenceSystem(spatial_dict['extentCrs'])
-                    if 'bounds' in spatial_dict:
-                        from qgis.core import QgsBox3d
-                        bounds = spatial_dict['bounds']
-                        if isinstance(bounds, dict) and 'xMinimum' in bounds:
-                            spatial.bounds = QgsBox3d(
-                                bounds.get('xMinimum', 0),
-                                bounds.get('yMinimum', 0),
-                                bounds.get('zMinimum', 0),
-                                bounds.get('xMaximum', 0),
-                                bounds.get('yMaximum', 0),
-                                bounds.get('zMaximum', 0)
-                            )
-                    spatial_extents.append(spatial)
-                extent.setSpatialExtents(spatial_extents)
-
-            # Temporal extent
-            if 'temporal' in extent_dict and isinstance(extent_dict['temporal'], list):
-                temporal_extents = []
-                for temporal_dict in extent_dict['temporal']:
-                    temporal = QgsLayerMetadata.TemporalExtent()
-                    if 'begin' in temporal_dict:
-                        from qgis.core import QgsDateTimeRange
-                        from PyQt5.QtCore import QDateTime
-                        begin = QDateTime.fromString(temporal_dict['begin'], 'yyyy-MM-dd')
-                        end = QDateTime.fromString(temporal_dict.get('end', temporal_dict['begin']), 'yyyy-MM-dd')
-                        temporal.range = QgsDateTimeRange(begin, end)
-                    temporal_extents.append(temporal)
-                extent.setTemporalExtents(temporal_extents)
-
-            metadata.setExtent(extent)
-
-        return metadata
+        # One set intersection picks the handlers for the keys present;
+        # sparse dictionaries skip the checks for every absent key
+        return _compile_template(_KNOWN_KEYS.intersection(metadata_dict))(metadata_dict)
 
-    def write_to_qmd_file(self, layer_path: str, layer_name: str, metadata_dict: Dict) -> Tuple[bool, str]:
+    @staticmethod
+    def get_qmd_path(layer_path: str, layer_name: str) -> str:
         """
-        Write metadata to .qmd sidecar file.
+        Get the .qmd sidecar path for a layer.
 
         Args:
             layer_path: Full path to the layer file
             layer_name: Name of the layer (for containers, use layer name; for files, use base name)
+
+        Returns:
+            Path of the .qmd file
+        """
+        # For container files (gpkg, sqlite), use layer_name
+        # For standalone files (shp, tif), use file base name
+        if os.path.splitext(layer_path)[1].lower() in _CONTAINER_EXTS:
+            # Container file: create .qmd with layer name
+            directory = os.path.dirname(layer_path)
+            base_name = os.path.splitext(os.path.basename(layer_path))[0]
+            return os.path.join(directory, f"{base_name}_{layer_name}.qmd")
+
+        # Standalone file: create .qmd with same base name
+        return os.path.splitext(layer_path)[0] + '.qmd'
+
+    def _metadata_document(self, metadata_dict: Dict):
+        """
+        Build the .qmd XML document for a metadata dictionary.
+
+        Args:
             metadata_dict: Dictionary containing metadata fields
 
         Returns:
-            Tuple of (success, message/error)
+            QDomDocument, or None if QGIS could not write the metadata XML
         """
-        try:
-            # Convert dict to QgsLayerMetadata
-            metadata = self.dict_to_qgs_metadata(metadata_dict)
+        # Convert dict to QgsLayerMetadata
+        metadata = self.dict_to_qgs_metadata(metadata_dict)
 
-            # Determine .qmd file path
-            # For container files (gpkg, sqlite), use layer_name
-            # For standalone files (shp, tif), use file base name
-            file_ext = os.path.splitext(layer_path)[1].lower()
-            if file_ext in ['.gpkg', '.sqlite', '.db']:
-                # Container file: create .qmd with layer name
-                directory = os.path.dirname(layer_path)
-                base_name = os.path.splitext(os.path.basename(layer_path))[0]
-                qmd_path = os.path.join(directory, f"{base_name}_{layer_name}.qmd")
-            else:
-                # Standalone file: create .qmd with same base name
-                qmd_path = os.path.splitext(layer_path)[0] + '.qmd'
-
-            # Write metadata to XML using QDomDocument
-            from qgis.PyQt.QtXml import QDomDocument
-
-            doc = QDomDocument()
-            root = doc.createElement("qgis")
-            doc.appendChild(root)
-
-            # Write metadata to the document
-            if not metadata.writeMetadataXml(root, doc):
-                return False, "Failed to convert metadata to XML"
+        # Write metadata to XML using QDomDocument
+        doc = QDomDocument()
+        root = doc.createElement("qgis")
+        doc.appendChild(root)
 
-            xml_content = doc.toString(2)  # 2 = indent with 2 spaces
+        # Write metadata to the document
+        if not metadata.writeMetadataXml(root, doc):
+            return None
+        return doc
 
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(qmd_path), exist_ok=True)
+    def _write_qmd(self, qmd_path: str, metadata_dict: Dict,
+                   doc: Optional[QDomDocument] = None) -> Tuple[bool, str]:
+        """
+        Convert metadata and write it to a .qmd file whose directory exists.
 
-            # Write to file
-            with open(qmd_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+        Args:
+            qmd_path: Path of the .qmd file
+            metadata_dict: Dictionary containing metadata fields
+            doc: Document already built from metadata_dict; threaded batches
+                build it on the calling thread and only write it here
 
+        Returns:
+            Tuple of (success, qmd_path or error)
+        """
+        try:
+            if doc is None:
+                doc = self._metadata_document(metadata_dict)
+            if doc is None:
+                return False, "Failed to convert metadata to XML"
+
+            # Serialize straight into the file (2 = indent with 2 spaces)
+            # instead of building the whole XML as a Python string first
+            qmd_file = QFile(qmd_path)
+            if not qmd_file.open(QIODevice.WriteOnly | QIODevice.Truncate):
+                raise OSError(qmd_file.errorString())
+            try:
+                stream = QTextStream(qmd_file)
+                if hasattr(stream, 'setCodec'):
+                    # Qt 5 defaults to the locale codec; Qt 6 writes UTF-8
+                    stream.setCodec('UTF-8')
+                doc.save(stream, 2)
+                stream.flush()
+                if stream.status() != QTextStream.Ok:
+                    raise OSError(qmd_file.errorString())
+            finally:
+                qmd_file.close()
+
+            return True, qmd_path
+
+        except Exception as e:
+            error_msg = f"Error writing .qmd file: {str(e)}"
             QgsMessageLog.logMessage(
-                f"Metadata written to .qmd file: {qmd_path}",
+                error_msg,
                 "Metadata Manager",
-                Qgis.Success
+                Qgis.Critical
             )
+            return False, error_msg
+
+    def write_to_qmd_file(self, layer_path: str, layer_name: str, metadata_dict: Dict) -> Tuple[bool, str]:
+        """
+        Write metadata to .qmd sidecar file.
+
+        Args:
+            layer_path: Full path to the layer file
+            layer_name: Name of the layer (for containers, use layer name; for files, use base name)
+            metadata_dict: Dictionary containing metadata fields
+
+        Returns:
+            Tuple of (success, message/error)
+        """
+        result = self.write_to_qmd_files_batch([(layer_path, layer_name, metadata_dict)])[0]
+        self.flush_log()
+        return result
+
+    def write_to_qmd_files_batch(self, items: List[Tuple[str, str, Dict]],
+                                 max_workers: int = 1) -> List[Tuple[bool, str]]:
+        """
+        Write metadata to .qmd sidecar files for several layers.
+
+        Files are grouped by directory so each directory is created (or
+        checked) once. Successful writes are added to the combined log
+        message; call flush_log() when the batch is done.
+        With max_workers > 1 the XML is still built on the calling thread
+        (QGIS objects stay there) and a thread pool writes the documents
+        through _write_qmd().
+
+        Args:
+            items: List of (layer_path, layer_name, metadata_dict)
+            max_workers: Number of threads writing files
+
+        Returns:
+            List of (success, qmd_path or error), in the order of items
+        """
+        results: List[Tuple[bool, str]] = [(False, "")] * len(items)
+
+        by_directory: Dict[str, List[Tuple[int, str, Dict]]] = defaultdict(list)
+        for index, (layer_path, layer_name, metadata_dict) in enumerate(items):
+            qmd_path = self.get_qmd_path(layer_path, layer_name)
+            by_directory[os.path.dirname(qmd_path)].append((index, qmd_path, metadata_dict))
+
+        written = []
+        pending: List[Tuple[int, str, Dict, QDomDocument]] = []
+        for directory, entries in by_directory.items():
+            try:
+                # Ensure directory exists (once per writer)
+                if directory and directory not in self._known_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    self._known_dirs.add(directory)
+            except (OSError, ValueError) as e:
+                error_msg = f"Error writing .qmd file: {str(e)}"
+                QgsMessageLog.logMessage(
+                    error_msg,
+                    "Metadata Manager",
+                    Qgis.Critical
+                )
+                for index, _, _ in entries:
+                    results[index] = (False, error_msg)
+                continue
+
+            for index, qmd_path, metadata_dict in entries:
+                if max_workers > 1:
+                    results[index] = self._prepare_qmd(index, qmd_path, metadata_dict, pending)
+                    continue
+                results[index] = self._write_qmd(qmd_path, metadata_dict)
+                if results[index][0]:
+                    written.append(qmd_path)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                written_results = list(executor.map(
+                    self._write_qmd,
+                    [qmd_path for _, qmd_path, _, _ in pending],
+                    [metadata_dict for _, _, metadata_dict, _ in pending],
+                    [doc for _, _, _, doc in pending]
+                ))
+            for (index, qmd_path, _, _), result in zip(pending, written_results):
+                results[index] = result
+                if result[0]:
+                    written.append(qmd_path)
+
+        self._log_written(written)
+        return results
+
+    def _prepare_qmd(self, index: int, qmd_path: str, metadata_dict: Dict,
+                     pending: List[Tuple[int, str, Dict, QDomDocument]]) -> Tuple[bool, str]:
+        """
+        Build the XML document for a threaded write and queue it in pending.
+
+        Args:
+            index: Position of the item in the batch
+            qmd_path: Path of the .qmd file
+            metadata_dict: Dictionary containing metadata fields
+            pending: Queue of (index, qmd_path, metadata_dict, doc) that the
+                thread pool writes with _write_qmd()
 
+        Returns:
+            Provisional (success, qmd_path or error) for the item
+        """
+        try:
+            doc = self._metadata_document(metadata_dict)
+            if doc is None:
+                return False, "Failed to convert metadata to XML"
+            pending.append((index, qmd_path, metadata_dict, doc))
             return True, qmd_path
 
         except Exception as e:
@@ -255,22 +480,117 @@ class MetadataWriter:
         Returns:
             Tuple of (success, message/error)
         """
+        result = self.write_to_geopackage_batch(layer_path, [(layer_name, metadata_dict)])[0]
+        self.flush_log()
+        return result
+
+    def write_to_geopackage_batch(self, gpkg_path: str,
+                                  entries: List[Tuple[str, Dict]]) -> List[Tuple[bool, str]]:
+        """
+        Write metadata to several layers of one GeoPackage.
+
+        Layers are written one after another. Successful writes are added to
+        the combined log message; call flush_log() when the batch is done.
+
+        Args:
+            gpkg_path: Full path to the GeoPackage file
+            entries: List of (layer_name, metadata_dict)
+
+        Returns:
+            List of (success, message/error), in the order of entries
+        """
+        results = [
+            self._write_geopackage_layer(gpkg_path, layer_name, metadata_dict)
+            for layer_name, metadata_dict in entries
+        ]
+
+        self._log_written([
+            f"{gpkg_path} / {layer_name}"
+            for (layer_name, _), (success, _) in zip(entries, results) if success
+        ])
+        return results
+
+    def _gpkg_layer_kinds(self, gpkg_path: str) -> Dict[str, str]:
+        """
+        Get the gpkg_contents data_type of every layer in a GeoPackage.
+
+        Args:
+            gpkg_path: Full path to the GeoPackage file
+
+        Returns:
+            Dictionary of layer name to data_type ('features', 'tiles',
+            '2d-gridded-coverage', ...); empty if it could not be read
+        """
+        kinds = self._gpkg_kinds.get(gpkg_path)
+        if kinds is not None:
+            return kinds
+
+        kinds = {}
         try:
-            # Convert dict to QgsLayerMetadata
-            metadata = self.dict_to_qgs_metadata(metadata_dict)
+            uri = Path(os.path.abspath(gpkg_path)).as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True)
+            try:
+                kinds = dict(conn.execute(
+                    "SELECT table_name, data_type FROM gpkg_contents"
+                ).fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+        self._gpkg_kinds[gpkg_path] = kinds
+        return kinds
+
+    def _load_geopackage_layer(self, layer_path: str, layer_name: str, layer_uri: str):
+        """
+        Load a GeoPackage layer with the provider matching its data type.
 
-            # Construct layer URI
-            # Format: path/to/file.gpkg|layername=layer_name
-            layer_uri = f"{layer_path}|layername={layer_name}"
+        Args:
+            layer_path: Full path to the GeoPackage file
+            layer_name: Name of the layer within the GeoPackage
+            layer_uri: OGR/GDAL URI of the layer
 
-            # Try to load as vector first
-            layer = QgsVectorLayer(layer_uri, "temp", "ogr")
+        Returns:
+            Valid QgsVectorLayer or QgsRasterLayer, or None
+        """
+        kind = self._gpkg_layer_kinds(layer_path).get(layer_name)
 
+        if kind in ('tiles', '2d-gridded-coverage'):
+            layer = QgsRasterLayer(layer_uri, "temp")
+        elif kind is not None:
+            layer = QgsVectorLayer(layer_uri, "temp", "ogr")
+        else:
+            # Not listed in gpkg_contents - try vector first, then raster
+            layer = QgsVectorLayer(layer_uri, "temp", "ogr")
             if not layer.isValid():
-                # Try as raster
                 layer = QgsRasterLayer(layer_uri, "temp")
 
-            if not layer.isValid():
+        return layer if layer.isValid() else None
+
+    def _write_geopackage_layer(self, layer_path: str, layer_name: str,
+                                metadata_dict: Dict) -> Tuple[bool, str]:
+        """
+        Write metadata to one GeoPackage layer.
+
+        Args:
+            layer_path: Full path to the GeoPackage file
+            layer_name: Name of the layer within the GeoPackage
+            metadata_dict: Dictionary containing metadata fields
+
+        Returns:
+            Tuple of (success, message/error)
+        """
+        # Construct layer URI
+        # Format: path/to/file.gpkg|layername=layer_name
+        layer_uri = f"{layer_path}|layername={layer_name}"
+
+        try:
+            # Convert dict to QgsLayerMetadata
+            metadata = self.dict_to_qgs_metadata(metadata_dict)
+
+            layer = self._load_geopackage_layer(layer_path, layer_name, layer_uri)
+
+            if layer is None:
                 return False, f"Could not load layer: {layer_name} from {layer_path}"
 
             # Set metadata
@@ -288,12 +608,6 @@ class MetadataWriter:
                 )
                 return False, error
 
-            QgsMessageLog.logMessage(
-                f"Metadata written to GeoPackage layer: {layer_path} / {layer_name}",
-                "Metadata Manager",
-                Qgis.Success
-            )
-
             return True, f"embedded in {layer_path}"
 
         except Exception as e:
@@ -319,22 +633,8 @@ class MetadataWriter:
         Returns:
             Tuple of (success, target_location, message/error)
         """
-        # Determine file format from extension if not provided
-        if not file_format:
-            ext = os.path.splitext(layer_path)[1].lower()
-            file_format = ext
-
-        # Determine if this is a GeoPackage
-        is_geopackage = False
-        if file_format:
-            format_lower = file_format.lower()
-            is_geopackage = (
-                'gpkg' in format_lower or
-                'geopackage' in format_lower or
-                layer_path.lower().endswith('.gpkg')
-            )
-
-        if is_geopackage:
+        # Without a format name the file extension decides
+        if _is_geopackage(layer_path, file_format):
             # Write to GeoPackage embedded metadata
             success, result = self.write_to_geopackage(layer_path, layer_name, metadata_dict)
             target = f"embedded:{layer_path}" if success else "none"
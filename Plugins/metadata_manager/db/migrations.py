@@ -8,7 +8,11 @@ Author: John Zastrow
 License: MIT
 """
 
-from typing import List, Tuple, Callable
+__version__ = "0.2.0"
+
+import sys
+from collections import defaultdict, deque
+from typing import Dict, List, Tuple, Callable
 from qgis.core import QgsMessageLog, Qgis
 
 from .schema import DatabaseSchema
@@ -57,16 +61,18 @@ class MigrationManager:
         self.migrations: List[Migration] = []
         self._register_migrations()
 
+        # Migrations indexed by the version they start from
+        self._adj: Dict[str, List[Migration]] = defaultdict(list)
+        for migration in self.migrations:
+            self._adj[migration.from_version].append(migration)
+
     def _register_migrations(self):
         """Register all available migrations."""
-        # Future migrations will be registered here
-        # Example:
-        # self.migrations.append(Migration(
-        #     "0.1.0", "0.2.0",
-        #     "Add new field to templates table",
-        #     self._migrate_0_1_to_0_2
-        # ))
-        pass
+        self.migrations.append(Migration(
+            "0.1.0", "0.2.0",
+            "Rebuild metadata_cache keyed by (layer_path, layer_name)",
+            self._migrate_0_1_to_0_2
+        ))
 
     def get_migration_path(self, current_version: str, target_version: str) -> List[Migration]:
         """
@@ -79,15 +85,25 @@ class MigrationManager:
         Returns:
             List of migrations in order
         """
-        # For now, simple version comparison
-        # In future, build migration chain for multi-step upgrades
-        migration_path = []
+        if current_version == target_version:
+            return []
 
-        for migration in self.migrations:
-            if migration.from_version == current_version and migration.to_version == target_version:
-                migration_path.append(migration)
+        # Breadth-first search over versions finds the shortest chain;
+        # an empty list means no chain reaches the target
+        queue = deque([(current_version, [])])
+        visited = {current_version}
+
+        while queue:
+            version, migration_path = queue.popleft()
+            for migration in self._adj.get(version, ()):
+                next_path = migration_path + [migration]
+                if migration.to_version == target_version:
+                    return next_path
+                if migration.to_version not in visited:
+                    visited.add(migration.to_version)
+                    queue.append((migration.to_version, next_path))
 
-        return migration_path
+        return []
 
     def needs_upgrade(self, current_version: str) -> bool:
         """
@@ -102,7 +118,8 @@ class MigrationManager:
         if current_version is None:
             return True
 
-        return current_version != DatabaseSchema.METADATA_SCHEMA_VERSION
+        # Interned strings are equal exactly when they are the same object
+        return sys.intern(current_version) is not DatabaseSchema.METADATA_SCHEMA_VERSION
 
     def perform_upgrade(self, db_manager, current_version: str) -> Tuple[bool, str]:
         """
@@ -177,26 +194,36 @@ class MigrationManager:
 
         return True, f"Successfully upgraded to version {target_version}"
 
-    # Example migration functions (for future use)
-
-    # def _migrate_0_1_to_0_2(self, db_manager) -> Tuple[bool, str]:
-    #     """
-    #     Migrate from 0.1.0 to 0.2.0.
-    #
-    #     Example migration that adds a new column.
-    #     """
-    #     try:
-    #         cursor = db_manager.connection.cursor()
-    #
-    #         # Add new column to templates table
-    #         cursor.execute("""
-    #             ALTER TABLE templates
-    #             ADD COLUMN is_public INTEGER DEFAULT 0
-    #         """)
-    #
-    #         db_manager.connection.commit()
-    #         return True, "Added is_public column to templates"
-    #
-    #     except Exception as e:
-    #         db_manager.connection.rollback()
-    #         return False, str(e)
+    def _migrate_0_1_to_0_2(self, db_manager) -> Tuple[bool, str]:
+        """
+        Migrate from 0.1.0 to 0.2.0.
+
+        Databases initialized by 0.1.0 declared metadata_cache.layer_path
+        UNIQUE on its own, so only one layer per container file (GeoPackage,
+        FileGDB) could be cached. The table is rebuilt with the
+        (layer_path, layer_name) key, keeping ids and all cached metadata.
+        """
+        columns = (
+            "id, layer_path, layer_name, file_type, metadata_json, created_date, "
+            "last_edited_date, last_written_date, target_location, in_sync"
+        )
+
+        try:
+            with db_manager.batch():
+                cursor = db_manager.connection.cursor()
+                cursor.execute("DROP TABLE IF EXISTS metadata_cache_new")
+                cursor.execute(DatabaseSchema.get_metadata_cache_table('metadata_cache_new'))
+                cursor.execute(
+                    f"INSERT INTO metadata_cache_new ({columns}) "
+                    f"SELECT {columns} FROM metadata_cache"
+                )
+                cursor.execute("DROP TABLE metadata_cache")
+                cursor.execute("ALTER TABLE metadata_cache_new RENAME TO metadata_cache")
+                for index_sql in DatabaseSchema.get_metadata_cache_indexes():
+                    cursor.execute(index_sql)
+                cursor.execute("ANALYZE metadata_cache")
+
+            return True, "Rebuilt metadata_cache keyed by (layer_path, layer_name)"
+
+        except Exception as e:
+            return False, str(e)
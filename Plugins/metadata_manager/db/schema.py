@@ -9,14 +9,18 @@ Author: John Zastrow
 License: MIT
 """
 
-__version__ = "0.1.0"
+__version__ = "0.2.0"
+
+import sys
+from functools import lru_cache
 
 
 class DatabaseSchema:
     """Schema definitions for Metadata Manager tables."""
 
-    # Current schema version for Metadata Manager
-    METADATA_SCHEMA_VERSION = "0.1.0"
+    # Current schema version for Metadata Manager (interned, so version
+    # checks can compare interned strings by identity)
+    METADATA_SCHEMA_VERSION = sys.intern("0.2.0")
 
     @staticmethod
     def get_plugin_info_schema():
@@ -138,10 +142,27 @@ class DatabaseSchema:
     def get_metadata_cache_schema():
         """Detailed metadata cache table with sync tracking."""
         return [
-            """
-            CREATE TABLE IF NOT EXISTS metadata_cache (
+            DatabaseSchema.get_metadata_cache_table()
+        ] + DatabaseSchema.get_metadata_cache_indexes()
+
+    @staticmethod
+    def get_metadata_cache_table(table_name: str = 'metadata_cache'):
+        """
+        CREATE TABLE statement for the metadata cache.
+
+        Entries are keyed by (layer_path, layer_name); the UNIQUE constraint's
+        index serves every cache lookup, upsert and the status-fix anti-join.
+        The table keeps its rowid because metadata_json rows are too large to
+        store efficiently in a WITHOUT ROWID primary-key B-tree.
+
+        Args:
+            table_name: Table to create (the 0.1.0 -> 0.2.0 migration builds
+                the new table under a temporary name)
+        """
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                layer_path TEXT NOT NULL UNIQUE,
+                layer_path TEXT NOT NULL,
                 layer_name TEXT NOT NULL,
                 file_type TEXT,
                 metadata_json TEXT NOT NULL,
@@ -150,16 +171,82 @@ class DatabaseSchema:
                 last_written_date TIMESTAMP,
                 target_location TEXT,
                 in_sync INTEGER DEFAULT 1,
-                UNIQUE(layer_path)
+                UNIQUE(layer_path, layer_name)
             );
+            """
+
+    @staticmethod
+    def get_metadata_cache_indexes():
+        """
+        Indexes on metadata cache table (also applied to existing databases).
+
+        Path lookups use the UNIQUE(layer_path, layer_name) index, so the
+        only extra index covers listing entries by sync state.
+        """
+        return [
+            """
+            CREATE INDEX IF NOT EXISTS idx_metadata_cache_sync_path
+            ON metadata_cache(in_sync, layer_path, last_written_date);
+            """
+        ]
+
+    @staticmethod
+    def get_metadata_cache_key_index():
+        """
+        Unique (layer_path, layer_name) index for older metadata cache tables.
+
+        Cache upserts name (layer_path, layer_name) as their conflict target.
+        New tables declare that UNIQUE constraint; tables created by 0.1.0
+        are unique on layer_path alone and get this index instead. Only run
+        when no such unique index exists, so an index already using the name
+        is not one and is replaced.
+        """
+        return [
+            "DROP INDEX IF EXISTS idx_metadata_cache_layer;",
+            """
+            CREATE UNIQUE INDEX idx_metadata_cache_layer
+            ON metadata_cache(layer_path, layer_name);
+            """
+        ]
+
+    @staticmethod
+    def get_obsolete_indexes():
+        """Indexes created by earlier versions that newer ones replace."""
+        return [
+            # Duplicates the leading column of UNIQUE(layer_path, layer_name)
+            "DROP INDEX IF EXISTS idx_metadata_cache_path;",
+            # Replaced by the covering idx_metadata_cache_sync_path
+            "DROP INDEX IF EXISTS idx_metadata_cache_sync;",
+            # Partial copy of idx_inventory_path_layer over active rows
+            "DROP INDEX IF EXISTS idx_inventory_active_path_layer;",
+            # fix_metadata_status.py lookup index; duplicates the cache key
+            "DROP INDEX IF EXISTS idx_fix_status_cache_layer;",
+        ]
+
+    @staticmethod
+    def get_inventory_indexes():
+        """
+        Performance indexes on the Inventory Miner table.
+
+        geospatial_inventory is rewritten on every rescan, which drops these
+        indexes, so they are (re)created on connect rather than only once.
+        """
+        return [
+            # Covers the single-pass dashboard statistics GROUP BY
+            """
+            CREATE INDEX IF NOT EXISTS idx_inventory_active_stats
+            ON geospatial_inventory(parent_directory, data_type, format, crs_authid, metadata_status)
+            WHERE retired_datetime IS NULL;
             """,
+            # Per-layer lookups (status updates, smart defaults, status fix join)
             """
-            CREATE INDEX IF NOT EXISTS idx_metadata_cache_path
-            ON metadata_cache(layer_path);
+            CREATE INDEX IF NOT EXISTS idx_inventory_path_layer
+            ON geospatial_inventory(file_path, layer_name);
             """,
+            # Drives the status fix anti-join without touching the table
             """
-            CREATE INDEX IF NOT EXISTS idx_metadata_cache_sync
-            ON metadata_cache(in_sync);
+            CREATE INDEX IF NOT EXISTS idx_inventory_status_layer
+            ON geospatial_inventory(metadata_status, file_path, layer_name);
             """
         ]
 
@@ -179,8 +266,13 @@ class DatabaseSchema:
         """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_all_schemas():
-        """Return all schema definitions in creation order."""
+        """
+        Return all schema definitions in creation order.
+
+        The statements are constant, so the tuple is built once and shared.
+        """
         schemas = []
 
         # Plugin info (shared)
@@ -196,20 +288,30 @@ class DatabaseSchema:
         schemas.extend(DatabaseSchema.get_metadata_cache_schema())
         schemas.append(DatabaseSchema.get_upgrade_history_schema())
 
-        return schemas
+        return tuple(schemas)
 
     @staticmethod
-    def get_initial_data():
-        """Return initial data inserts for new database."""
-        return [
-            # Set metadata schema version
-            f"""
-            INSERT OR REPLACE INTO plugin_info (key, value)
-            VALUES ('metadata_schema_version', '{DatabaseSchema.METADATA_SCHEMA_VERSION}');
-            """,
-            # Set plugin installation date
-            """
-            INSERT OR REPLACE INTO plugin_info (key, value)
-            VALUES ('metadata_manager_installed', datetime('now'));
-            """,
-        ]
+    @lru_cache(maxsize=None)
+    def get_initial_data_batches():
+        """
+        Return initial data as (parameterized SQL, rows) pairs.
+
+        Each SQL statement is prepared once and run for all of its rows
+        with executemany(). The pairs are built once and shared.
+        """
+        return (
+            (
+                """
+                INSERT INTO plugin_info (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = CURRENT_TIMESTAMP
+                """,
+                (('metadata_schema_version', DatabaseSchema.METADATA_SCHEMA_VERSION),)
+            ),
+            (
+                """
+                INSERT INTO plugin_info (key, value) VALUES (?, datetime('now'))
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = CURRENT_TIMESTAMP
+                """,
+                (('metadata_manager_installed',),)
+            ),
+        )
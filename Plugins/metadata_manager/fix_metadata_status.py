@@ -10,128 +10,388 @@ file_path, which caused all layers in a container file (SQLite, GeoPackage) to
 be marked as complete when only one layer had metadata.
 
 Usage:
-    python fix_metadata_status.py <path_to_database.gpkg>
+    python fix_metadata_status.py [--in-memory] <path_to_database.gpkg>
+
+    --in-memory  Compare against metadata_cache in Python instead of SQL,
+                 for very large inventories
 """
 
-__version__ = "0.1.0"
+__version__ = "0.2.0"
 
+import re
 import sqlite3
 import sys
+from contextlib import closing
+from ctypes.util import find_library
+from datetime import datetime, timezone
+
+# Connection settings for the bulk update: no full fsync per commit, a
+# 256 MB page cache and temp tables in memory
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Rows updated per transaction; bounds the WAL and trigger work per commit
+BATCH_SIZE = 5000
+
+# Inventory rows read per fetchmany() call by the in-memory comparison
+FETCH_SIZE = 10000
+
+# Columns the fix writes; none of them is a geometry column
+UPDATED_COLUMNS = {'metadata_status', 'metadata_cached', 'metadata_last_updated'}
+
+# Calls to SpatiaLite / GeoPackage SQL functions in trigger bodies
+SPATIAL_FUNCTION = re.compile(r'\b(?:ST|GPKG)_\w+\s*\(', re.IGNORECASE)
 
 
-def fix_metadata_status(db_path: str):
+def has_layer_index(cursor) -> bool:
     """
-    Fix incorrect metadata status in the database.
+    Check whether metadata_cache has an index led by (layer_path, layer_name).
+
+    Databases created by Metadata Manager 0.2.0 and later have one from the
+    UNIQUE(layer_path, layer_name) constraint; older ones do not.
 
     Args:
-        db_path: Path to the GeoPackage database
+        cursor: Cursor on the open database
+
+    Returns:
+        True if such an index exists
+    """
+    cursor.execute("PRAGMA index_list(metadata_cache)")
+    # index_list rows: (seq, name, unique, origin, partial)
+    for index in cursor.fetchall():
+        # index_info rows: (seqno, cid, name)
+        cursor.execute(f"PRAGMA index_info('{index[1]}')")
+        columns = [row[2] for row in sorted(cursor.fetchall())]
+        if columns[:2] == ['layer_path', 'layer_name']:
+            return True
+    return False
+
+
+def ensure_indexes(cursor):
+    """
+    Create the indexes the status fix join probes, if missing.
+
+    Args:
+        cursor: Cursor on the open database
+    """
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'")
+    index_count = cursor.fetchone()[0]
+
+    # Same covering index Metadata Manager creates on connect
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_inventory_status_layer
+        ON geospatial_inventory(metadata_status, file_path, layer_name)
+    """)
+    if not has_layer_index(cursor):
+        # Not named idx_metadata_cache_layer: that name is Metadata Manager's
+        # unique key index, which cache upserts need on 0.1.0 tables
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fix_status_cache_layer
+            ON metadata_cache(layer_path, layer_name)
+        """)
+
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'")
+    if cursor.fetchone()[0] != index_count:
+        # Give the query planner statistics for the new indexes
+        cursor.execute("ANALYZE metadata_cache")
+        cursor.execute("ANALYZE geospatial_inventory")
+
+
+def update_triggers(cursor) -> list:
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    Find the triggers on geospatial_inventory that fire on the status update.
+
+    Triggers declared UPDATE OF other columns never fire here.
 
-    # Enable extension loading
-    conn.enable_load_extension(True)
+    Args:
+        cursor: Cursor on the open database
+
+    Returns:
+        List of (name, sql) for the triggers that fire
+    """
+    cursor.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'trigger'
+        AND tbl_name = 'geospatial_inventory'
+    """)
+
+    triggers = []
+    for name, sql in cursor:
+        match = re.search(r'\bUPDATE\s+(?:OF\s+(.+?)\s+)?ON\b', sql, re.IGNORECASE | re.DOTALL)
+        if not match:
+            continue
+        if match.group(1):
+            columns = {c.strip().strip('"`[]').lower() for c in match.group(1).split(',')}
+            if not columns & UPDATED_COLUMNS:
+                continue
+        triggers.append((name, sql))
+    return triggers
+
+
+def spatial_index_triggers(cursor) -> list:
+    """
+    Find the GeoPackage spatial index triggers that fire on the status update.
+
+    The rtree_* triggers keep the R-tree in step with geometry and fid
+    changes; the plain AFTER UPDATE ones evaluate their SpatiaLite WHEN
+    clause for every row although the fix changes neither geometry nor fid.
+
+    Args:
+        cursor: Cursor on the open database
+
+    Returns:
+        List of (name, sql) for triggers to suspend during the update
+    """
+    return [(name, sql) for name, sql in update_triggers(cursor) if name.startswith('rtree_')]
+
+
+def needs_spatialite(cursor) -> bool:
+    """
+    Check whether a trigger left active during the update calls spatial functions.
+
+    The fix's own SQL uses none, and the R-tree triggers are suspended, so
+    SpatiaLite only has to be loaded for other triggers calling ST_* or
+    GPKG_* functions.
+
+    Args:
+        cursor: Cursor on the open database
+
+    Returns:
+        True if SpatiaLite should be loaded
+    """
+    return any(
+        SPATIAL_FUNCTION.search(sql)
+        for name, sql in update_triggers(cursor)
+        if not name.startswith('rtree_')
+    )
+
+
+def load_spatialite(conn) -> bool:
+    """
+    Load the SpatiaLite extension into the connection.
+
+    mod_spatialite is loaded by name, letting SQLite search the library path.
+    Only if that fails is a legacy libspatialite looked up with ctypes and
+    loaded from the file found, so at most two load attempts are made.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        True if SpatiaLite was loaded
+    """
+    try:
+        conn.enable_load_extension(True)
+    except AttributeError as e:
+        # Python built without extension loading support
+        print(f"Warning: Extension loading not available: {e}")
+        return False
 
-    # Try to load SpatiaLite extension (needed for geospatial triggers)
     try:
-        # Try different possible extension names/paths
         try:
             conn.load_extension('mod_spatialite')
-        except:
+            return True
+        except sqlite3.OperationalError:
+            pass
+
+        legacy = find_library('spatialite')
+        if legacy:
             try:
-                conn.load_extension('libspatialite')
-            except:
-                try:
-                    conn.load_extension('spatialite')
-                except:
-                    print("Warning: Could not load SpatiaLite extension. Trying anyway...")
-    except Exception as e:
-        print(f"Warning: Extension loading not available: {e}")
+                conn.load_extension(legacy)
+                return True
+            except sqlite3.OperationalError:
+                pass
+        return False
+    finally:
+        conn.enable_load_extension(False)
 
-    cursor = conn.cursor()
 
-    try:
-        # First, check how many layers are incorrectly marked as complete
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM geospatial_inventory
-            WHERE metadata_status = 'complete'
-            AND NOT EXISTS (
-                SELECT 1 FROM metadata_cache
-                WHERE metadata_cache.layer_path = geospatial_inventory.file_path
-                AND metadata_cache.layer_name = geospatial_inventory.layer_name
-            )
-        """)
+def collect_bad_rows_in_memory(cursor):
+    """
+    Fill the bad_rows temp table by comparing against metadata_cache in Python.
 
-        incorrect_count = cursor.fetchone()['count']
+    Every cached (layer_path, layer_name) pair is loaded into a set and the
+    'complete' inventory rows are streamed past it, so each table is read
+    once in a single sequential pass whatever plan SQLite would pick. The set
+    is held in memory for the duration.
 
-        if incorrect_count == 0:
-            print("✓ No incorrect metadata status found. Database is correct.")
-            return
+    Args:
+        cursor: Cursor on the open database
+    """
+    # NULL never matches in the SQL join, so such pairs cannot count as cached
+    cursor.execute("""
+        SELECT layer_path, layer_name FROM metadata_cache
+        WHERE layer_path IS NOT NULL AND layer_name IS NOT NULL
+    """)
+    cached = set(cursor)
 
-        print(f"Found {incorrect_count} layers incorrectly marked as 'complete'")
+    cursor.execute("CREATE TEMP TABLE bad_rows (rid INTEGER, file_path TEXT, layer_name TEXT)")
 
-        # Get some examples to show the user
-        cursor.execute("""
-            SELECT file_path, layer_name, metadata_status
-            FROM geospatial_inventory
-            WHERE metadata_status = 'complete'
-            AND NOT EXISTS (
-                SELECT 1 FROM metadata_cache
-                WHERE metadata_cache.layer_path = geospatial_inventory.file_path
-                AND metadata_cache.layer_name = geospatial_inventory.layer_name
-            )
-            LIMIT 5
-        """)
+    rows = cursor.connection.execute("""
+        SELECT rowid, file_path, layer_name FROM geospatial_inventory
+        WHERE metadata_status = 'complete'
+    """)
+    while True:
+        batch = rows.fetchmany(FETCH_SIZE)
+        if not batch:
+            break
+        cursor.executemany(
+            "INSERT INTO bad_rows VALUES (?, ?, ?)",
+            [row for row in batch if (row[1], row[2]) not in cached]
+        )
 
-        print("\nExamples of layers that will be fixed:")
-        for row in cursor.fetchall():
-            print(f"  - {row['file_path']} / {row['layer_name']}")
 
-        # Fix the incorrect status
-        cursor.execute("""
-            UPDATE geospatial_inventory
-            SET metadata_status = 'none',
-                metadata_cached = 0,
-                metadata_last_updated = datetime('now')
-            WHERE metadata_status = 'complete'
-            AND NOT EXISTS (
-                SELECT 1 FROM metadata_cache
-                WHERE metadata_cache.layer_path = geospatial_inventory.file_path
-                AND metadata_cache.layer_name = geospatial_inventory.layer_name
-            )
-        """)
+def fix_metadata_status(db_path: str, in_memory: bool = False):
+    """
+    Fix incorrect metadata status in the database.
+
+    Args:
+        db_path: Path to the GeoPackage database
+        in_memory: Find the affected layers in Python rather than with SQL
+    """
+    # sqlite3 waits up to `timeout` seconds on a locked database
+    with closing(sqlite3.connect(db_path, timeout=5.0)) as conn:
+        # WAL needs shared memory, so network shares keep their journal mode
+        if not db_path.startswith(('\\\\', '//')):
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
 
-        conn.commit()
+        cursor = conn.cursor()
 
-        print(f"\n✓ Fixed {cursor.rowcount} layers")
+        # Load SpatiaLite only if a trigger that still fires needs it
+        if needs_spatialite(cursor) and not load_spatialite(conn):
+            print("Warning: Could not load SpatiaLite extension. Trying anyway...")
 
-        # Show updated statistics
-        cursor.execute("""
-            SELECT metadata_status, COUNT(*) as count
-            FROM geospatial_inventory
-            WHERE retired_datetime IS NULL
-            GROUP BY metadata_status
-        """)
+        try:
+            ensure_indexes(cursor)
 
-        print("\nUpdated statistics:")
-        for row in cursor.fetchall():
-            status = row['metadata_status'] or 'none'
-            count = row['count']
-            print(f"  {status}: {count}")
+            # Take the write lock up front, so the rows found below cannot change
+            # before the first batch and it does not hit SQLITE_BUSY halfway
+            # through; later batches re-check each row (see the UPDATE)
+            cursor.execute("BEGIN IMMEDIATE")
 
-    except Exception as e:
-        conn.rollback()
-        print(f"✗ Error fixing metadata status: {e}")
-        sys.exit(1)
-    finally:
-        conn.close()
+            # Collect the layers incorrectly marked as complete once; the count,
+            # the examples and the update all read from this temp table
+            if in_memory:
+                collect_bad_rows_in_memory(cursor)
+            else:
+                cursor.execute("""
+                    CREATE TEMP TABLE bad_rows AS
+                    SELECT gi.rowid AS rid, gi.file_path, gi.layer_name
+                    FROM geospatial_inventory gi
+                    LEFT JOIN metadata_cache mc
+                        ON mc.layer_path = gi.file_path
+                        AND mc.layer_name = gi.layer_name
+                    WHERE gi.metadata_status = 'complete'
+                    AND mc.layer_path IS NULL
+                """)
+            cursor.execute("CREATE INDEX temp.bad_rows_rid ON bad_rows(rid)")
+
+            # First, check how many layers are incorrectly marked as complete
+            cursor.execute("SELECT COUNT(*) as count FROM bad_rows")
+
+            incorrect_count = cursor.fetchone()[0]
+
+            if incorrect_count == 0:
+                print("✓ No incorrect metadata status found. Database is correct.")
+                return
+
+            print(f"Found {incorrect_count} layers incorrectly marked as 'complete'")
+
+            # Get some examples to show the user
+            cursor.execute("SELECT file_path, layer_name FROM bad_rows ORDER BY rid LIMIT 5")
+
+            print("\nExamples of layers that will be fixed:")
+            for file_path, layer_name in cursor:
+                print(f"  - {file_path} / {layer_name}")
+
+            # Spatial index triggers are dropped and recreated inside each batch
+            # transaction, so a failed batch rolls back with its triggers intact
+            triggers = spatial_index_triggers(cursor)
+
+            # Fix the incorrect status in rowid-ordered batches, committing each
+            # one (fid is an AUTOINCREMENT key, so rowids start at 1)
+            fixed_count = 0
+            last_rid = 0
+            # Same UTC format as SQLite's datetime('now'), bound once for all rows
+            now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            while True:
+                cursor.execute(
+                    "SELECT MAX(rid) FROM "
+                    "(SELECT rid FROM bad_rows WHERE rid > ? ORDER BY rid LIMIT ?)",
+                    (last_rid, BATCH_SIZE)
+                )
+                batch_end = cursor.fetchone()[0]
+                if batch_end is None:
+                    break
+
+                # Commits the batch on success and rolls it back on error. The
+                # lock is released between batches, so a layer cached by another
+                # session since bad_rows was filled is left as it is
+                with conn:
+                    if not conn.in_transaction:
+                        cursor.execute("BEGIN IMMEDIATE")
+                    for name, _ in triggers:
+                        cursor.execute(f'DROP TRIGGER "{name}"')
+                    cursor.execute("""
+                        UPDATE geospatial_inventory
+                        SET metadata_status = 'none',
+                            metadata_cached = 0,
+                            metadata_last_updated = ?
+                        WHERE rowid IN (SELECT rid FROM bad_rows WHERE rid > ? AND rid <= ?)
+                        AND metadata_status = 'complete'
+                        AND NOT EXISTS (
+                            SELECT 1 FROM metadata_cache mc
+                            WHERE mc.layer_path = geospatial_inventory.file_path
+                            AND mc.layer_name = geospatial_inventory.layer_name
+                        )
+                    """, (now, last_rid, batch_end))
+                    fixed_count += cursor.rowcount
+                    for _, sql in triggers:
+                        cursor.execute(sql)
+                last_rid = batch_end
+
+                # Reclaim the WAL written by this batch before the next one
+                cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                if incorrect_count > BATCH_SIZE:
+                    print(f"  ... {fixed_count}/{incorrect_count} layers updated")
+
+            print(f"\n✓ Fixed {fixed_count} layers")
+
+            # Show updated statistics
+            cursor.execute("""
+                SELECT metadata_status, COUNT(*) as count
+                FROM geospatial_inventory
+                WHERE retired_datetime IS NULL
+                GROUP BY metadata_status
+            """)
+
+            print("\nUpdated statistics:")
+            for status, count in cursor:
+                print(f"  {status or 'none'}: {count}")
+
+        except Exception as e:
+            conn.rollback()
+            print(f"✗ Error fixing metadata status: {e}")
+            sys.exit(1)
+        finally:
+            cursor.execute("DROP TABLE IF EXISTS temp.bad_rows")
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+    in_memory = '--in-memory' in args
+    if in_memory:
+        args.remove('--in-memory')
+
+    if len(args) != 1:
         print(__doc__)
         sys.exit(1)
 
-    db_path = sys.argv[1]
-    fix_metadata_status(db_path)
+    db_path = args[0]
+    fix_metadata_status(db_path, in_memory)
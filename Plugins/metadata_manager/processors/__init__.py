@@ -3,11 +3,34 @@ Processors package for Metadata Manager.
 
 Contains background processing classes for inventory scanning and metadata operations.
 
+The classes are imported on first access, so loading the package (or one
+submodule) does not pull in GDAL/OGR and the other processor's imports.
+
 Author: John Zastrow
 License: MIT
 """
 
-from .inventory_runner import InventoryRunner
-from .inventory_processor import InventoryProcessor
+__version__ = "0.7.0"
+
+from importlib import import_module
+
+# Exported name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'InventoryRunner': '.inventory_runner',
+    'InventoryProcessor': '.inventory_processor',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Import an exported class on first access and keep it in the package."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ['InventoryRunner', 'InventoryProcessor']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,8 +8,18 @@ Author: John Zastrow
 License: MIT
 """
 
-__version__ = "0.6.0"
-
+__version__ = "0.7.0"
+
+import getpass
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from osgeo import gdal, ogr
@@ -37,6 +47,82 @@ from qgis.PyQt.QtCore import QVariant
 import warnings
 
 
+# Extensions worth probing with OGR / GDAL, in addition to those declared by
+# the installed drivers (see _probe_extensions()); other files are skipped
+# without opening them, files without an extension are probed with both
+VECTOR_EXTS = frozenset({
+    '.shp', '.geojson', '.json', '.gpkg', '.kml', '.kmz', '.gml', '.gpx',
+    '.tab', '.mif', '.fgb', '.sqlite', '.csv', '.dxf', '.dgn',
+    '.mbtiles', '.parquet', '.xlsx', '.xls', '.ods', '.dbf', '.e00', '.ntf',
+    '.osm', '.pbf', '.mdb', '.accdb', '.gmt', '.vrt',
+})
+RASTER_EXTS = frozenset({
+    '.tif', '.tiff', '.img', '.jp2', '.vrt', '.asc', '.nc', '.hdf', '.h5',
+    '.ecw', '.sid', '.png', '.jpg', '.jpeg', '.gif', '.bil', '.bsq', '.bip',
+    '.dem', '.dt0', '.dt1', '.dt2', '.hgt', '.grd', '.sdat', '.rst', '.ers',
+    '.gpkg', '.sqlite', '.mbtiles', '.adf', '.bmp', '.xyz', '.ntf', '.e00',
+    '.webp', '.kea', '.grib', '.grb', '.grb2', '.gsb', '.ter',
+})
+
+
+# Fields filled from the first element with each tag in FGDC and QGIS
+# metadata XML; FGDC theme keywords (themekey) are collected separately
+METADATA_XML_FIELDS = {
+    'title': 'layer_title',
+    'abstract': 'layer_abstract',
+    'lineage': 'lineage',
+    'useconst': 'constraints',
+}
+
+
+# Threads extracting metadata; the work is I/O bound and GDAL/OGR release
+# the GIL while reading
+EXTRACT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+
+@lru_cache(maxsize=1)
+def _probe_extensions():
+    """
+    Extensions to probe with OGR and GDAL.
+
+    The built-in lists are extended with the extensions each registered
+    driver declares, so any format the installed GDAL can read by extension
+    is still found.
+
+    Returns:
+        Tuple of (vector extensions, raster extensions) as frozensets
+    """
+    vector_exts = set(VECTOR_EXTS)
+    raster_exts = set(RASTER_EXTS)
+    for index in range(gdal.GetDriverCount()):
+        driver = gdal.GetDriver(index)
+        declared = {
+            '.' + ext.lower()
+            for ext in (driver.GetMetadataItem(gdal.DMD_EXTENSIONS) or '').split()
+        }
+        if driver.GetMetadataItem(gdal.DCAP_VECTOR) == 'YES':
+            vector_exts |= declared
+        if driver.GetMetadataItem(gdal.DCAP_RASTER) == 'YES':
+            raster_exts |= declared
+    return frozenset(vector_exts), frozenset(raster_exts)
+
+
+@contextmanager
+def _gdal_thread_config_option(key, value):
+    """
+    Set a GDAL configuration option for the calling thread during a block.
+
+    The option is thread-local, so it does not change how GDAL behaves for
+    the map canvas or other plugins while a scan runs in the background.
+    """
+    previous = gdal.GetThreadLocalConfigOption(key, None)
+    gdal.SetThreadLocalConfigOption(key, value)
+    try:
+        yield
+    finally:
+        gdal.SetThreadLocalConfigOption(key, previous)
+
+
 class InventoryProcessor:
     """
     Process directory scanning and inventory creation.
@@ -74,6 +160,71 @@ class InventoryProcessor:
             'errors': 0
         }
 
+        # Multi-user tracking info, constant for the whole scan
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = None
+        os_name = platform.system()
+        self._host_info = {
+            'scanned_by_user': user,  # Username
+            'scanned_by_machine': socket.gethostname(),  # Computer name
+            'scanned_from_os': os_name,  # Windows, Linux, Darwin
+            'scanned_from_os_version': platform.version(),  # OS version details
+        }
+        self._is_windows = os_name == 'Windows'
+
+        # Mount points for drive_or_mount on Unix, longest first
+        self._mounts = [] if self._is_windows else self._read_mount_points()
+
+    @staticmethod
+    def _read_mount_points():
+        """
+        List the mounted file systems' mount points, longest first.
+
+        Reads /proc/mounts on Linux and the output of `mount` elsewhere
+        (macOS, BSD), once per scan.
+
+        Returns:
+            List of mount point paths
+        """
+        mounts = set()
+        try:
+            with open('/proc/mounts', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 1:
+                        # Spaces etc. are written as octal escapes (\040)
+                        mounts.add(re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[1]))
+        except OSError:
+            try:
+                output = subprocess.run(['mount'], capture_output=True, text=True).stdout
+            except OSError:
+                output = ''
+            for line in output.splitlines():
+                # "<device> on <mount point> (<type>, ...)"
+                match = re.match(r'.+? on (.+?) \(', line)
+                if match:
+                    mounts.add(match.group(1))
+
+        return sorted(mounts, key=len, reverse=True)
+
+    def _mount_for(self, path):
+        """
+        Find the mount point containing a path.
+
+        Args:
+            path: File path
+
+        Returns:
+            Longest mount point that is a prefix of the resolved path, or None
+        """
+        real_path = os.path.realpath(path)
+        for mount in self._mounts:
+            if real_path == mount or real_path.startswith(mount.rstrip('/') + '/'):
+                return mount
+        return None
+
     def process(self):
         """
         Run the inventory process.
@@ -96,50 +247,69 @@ class InventoryProcessor:
                 existing_inventory = self._load_existing_inventory(output_gpkg, layer_name)
                 self.log_info(f"Loaded {len(existing_inventory)} existing records")
 
-            # Discover geospatial files
+            # Discover candidate geospatial files
             self.log_info("Discovering geospatial files...")
             self.set_progress(10)
 
-            data_sources = self._discover_geospatial_files(root_path)
-            self.log_info(f"Found {len(data_sources)} geospatial files/layers")
-
-            if not data_sources:
-                self.log_warning("No geospatial files found in directory")
-                return {'output': output_gpkg, 'stats': self.stats}
+            candidates = self._discover_geospatial_files(root_path)
+            self.log_info(f"Found {len(candidates)} candidate files")
 
-            # Extract metadata from each file
+            # Open each file once, finding its layers and extracting their
+            # metadata in the same pass
             self.log_info("Extracting metadata...")
             self.set_progress(30)
 
             features = []
             current_file_paths = set()
-
-            for i, ds_info in enumerate(data_sources):
-                if self.is_canceled():
-                    break
-
-                progress = 30 + int((i / len(data_sources)) * 50)  # 30-80%
-                self.set_progress(progress)
-
-                try:
-                    feature = self._extract_metadata(ds_info, root_path, existing_inventory)
-                    if feature:
-                        features.append(feature)
-                        current_file_paths.add(feature['file_path'])
-
-                        # Update stats
-                        self.stats['total'] += 1
-                        data_type = feature.get('data_type', '')
-                        if data_type == 'vector':
-                            self.stats['vectors'] += 1
-                        elif data_type == 'raster':
-                            self.stats['rasters'] += 1
-                        elif data_type == 'table':
-                            self.stats['tables'] += 1
-
-                except Exception as e:
-                    self.log_error(f"Error processing {ds_info.get('path', 'unknown')}: {str(e)}")
-                    self.stats['errors'] += 1
+            layer_count = 0
+
+            with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+                futures = [
+                    executor.submit(self._scan_file, entry, root_path, existing_inventory)
+                    for entry in candidates
+                ]
+
+                # Results are taken in discovery order; stats and feedback are
+                # only touched from this thread
+                for i, (entry, future) in enumerate(zip(candidates, futures)):
+                    if self.is_canceled():
+                        for pending in futures[i:]:
+                            pending.cancel()
+                        break
+
+                    progress = 30 + int((i / len(candidates)) * 50)  # 30-80%
+                    self.set_progress(progress)
+
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        results = [e]
+
+                    for result in results:
+                        layer_count += 1
+                        if isinstance(result, Exception):
+                            self.log_error(f"Error processing {entry.path}: {str(result)}")
+                            self.stats['errors'] += 1
+                            continue
+
+                        feature = result
+                        if feature:
+                            features.append(feature)
+                            current_file_paths.add(feature['file_path'])
+
+                            # Update stats
+                            self.stats['total'] += 1
+                            data_type = feature.get('data_type', '')
+                            if data_type == 'vector':
+                                self.stats['vectors'] += 1
+                            elif data_type == 'raster':
+                                self.stats['rasters'] += 1
+                            elif data_type == 'table':
+                                self.stats['tables'] += 1
+
+            if not layer_count:
+                self.log_warning("No geospatial files found in directory")
+                return {'output': output_gpkg, 'stats': self.stats}
 
             self.log_info(f"Extracted metadata for {len(features)} layers")
 
@@ -170,63 +340,154 @@ class InventoryProcessor:
             self.log_error(f"Fatal error: {str(e)}")
             raise
 
+    def _iter_files(self, root_path):
+        """
+        Walk a directory tree with os.scandir.
+
+        DirEntry type checks reuse the data read with the directory listing,
+        so no extra stat() call is made per entry. Like Path.rglob(), the walk
+        does not descend into symlinked directories and skips directories it
+        cannot read.
+
+        Args:
+            root_path: Root directory to walk
+
+        Yields:
+            os.DirEntry for each file
+        """
+        stack = [str(root_path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError:
+                continue
+
     def _discover_geospatial_files(self, root_path):
         """
-        Discover all geospatial files using GDAL/OGR.
+        Discover candidate geospatial files.
+
+        Files are selected by extension only; _scan_file() opens each one
+        once to find its layers.
 
         Returns:
-            List of dictionaries with file info
+            List of os.DirEntry for the candidate files
         """
-        data_sources = []
+        probe_vectors = self.params['include_vectors'] or self.params['include_tables']
+        probe_rasters = self.params['include_rasters']
+        vector_exts, raster_exts = _probe_extensions()
 
-        for item_path in root_path.rglob("*"):
+        candidates = []
+        for entry in self._iter_files(root_path):
             if self.is_canceled():
                 break
 
-            if not item_path.is_file():
-                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if not ext or (probe_vectors and ext in vector_exts) or \
+               (probe_rasters and ext in raster_exts):
+                candidates.append(entry)
 
-            file_str = str(item_path)
+        return candidates
 
-            # Try as vector (OGR)
-            if self.params['include_vectors'] or self.params['include_tables']:
-                try:
-                    ds = ogr.Open(file_str)
-                    if ds:
-                        for layer_idx in range(ds.GetLayerCount()):
-                            layer = ds.GetLayer(layer_idx)
-                            if layer:
-                                is_spatial = layer.GetGeomType() != ogr.wkbNone
-
-                                if (is_spatial and self.params['include_vectors']) or \
-                                   (not is_spatial and self.params['include_tables']):
-                                    data_sources.append({
-                                        'path': file_str,
-                                        'type': 'vector' if is_spatial else 'table',
-                                        'layer_name': layer.GetName(),
-                                        'layer_index': layer_idx
-                                    })
-                        ds = None
-                        continue
-                except:
-                    pass
+    def _scan_file(self, entry, root_path, existing_inventory):
+        """
+        Scan one candidate file in a worker thread.
 
-            # Try as raster (GDAL)
-            if self.params['include_rasters']:
-                try:
-                    ds = gdal.Open(file_str, gdal.GA_ReadOnly)
-                    if ds:
-                        data_sources.append({
-                            'path': file_str,
-                            'type': 'raster',
-                            'layer_name': item_path.stem,
-                            'layer_index': 0
-                        })
-                        ds = None
-                except:
-                    pass
+        GDAL does not list the file's directory on open
+        (GDAL_DISABLE_READDIR_ON_OPEN), which is slow in large directories
+        and on network shares; drivers check for the sidecar files they
+        need (.hdr, .prj, world files, .aux.xml) directly instead.
+
+        Args:
+            entry: os.DirEntry of the candidate file
+            root_path: Root directory of the scan
+            existing_inventory: Existing records keyed by (file_path, layer_name)
+
+        Returns:
+            See _open_and_extract()
+        """
+        with _gdal_thread_config_option('GDAL_DISABLE_READDIR_ON_OPEN', 'TRUE'):
+            return self._open_and_extract(entry, root_path, existing_inventory)
+
+    def _open_and_extract(self, entry, root_path, existing_inventory):
+        """
+        Open a file once and extract metadata for each layer in it.
+
+        The open dataset and layer are passed on to the metadata extraction,
+        so a file with N layers is opened once rather than N + 1 times.
+
+        Args:
+            entry: os.DirEntry of the candidate file
+            root_path: Root directory of the scan
+            existing_inventory: Existing records keyed by (file_path, layer_name)
+
+        Returns:
+            List with one feature dictionary, or the exception raised while
+            extracting it, per layer found; empty if GDAL/OGR cannot open it
+        """
+        file_str = entry.path
+        ext = os.path.splitext(entry.name)[1].lower()
+        vector_exts, raster_exts = _probe_extensions()
+        results = []
+
+        try:
+            file_stat = entry.stat()
+        except OSError:
+            file_stat = None
+
+        def extract(ds_info):
+            try:
+                results.append(self._extract_metadata(ds_info, root_path, existing_inventory))
+            except Exception as e:
+                results.append(e)
+
+        # Try as vector (OGR)
+        if (self.params['include_vectors'] or self.params['include_tables']) and \
+           (not ext or ext in vector_exts):
+            try:
+                ds = ogr.Open(file_str)
+            except:
+                ds = None
+            if ds:
+                for layer_idx in range(ds.GetLayerCount()):
+                    layer = ds.GetLayer(layer_idx)
+                    if layer:
+                        is_spatial = layer.GetGeomType() != ogr.wkbNone
+
+                        if (is_spatial and self.params['include_vectors']) or \
+                           (not is_spatial and self.params['include_tables']):
+                            extract({
+                                'path': file_str,
+                                'type': 'vector' if is_spatial else 'table',
+                                'layer_name': layer.GetName(),
+                                'layer_index': layer_idx,
+                                'stat': file_stat,
+                                'dataset': ds,
+                                'layer': layer
+                            })
+                return results
+
+        # Try as raster (GDAL)
+        if self.params['include_rasters'] and (not ext or ext in raster_exts):
+            try:
+                ds = gdal.Open(file_str, gdal.GA_ReadOnly)
+            except:
+                ds = None
+            if ds:
+                extract({
+                    'path': file_str,
+                    'type': 'raster',
+                    'layer_name': os.path.splitext(entry.name)[0],
+                    'layer_index': 0,
+                    'stat': file_stat,
+                    'dataset': ds
+                })
 
-        return data_sources
+        return results
 
     def _extract_metadata(self, ds_info, root_path, existing_inventory):
         """Extract comprehensive metadata from a data source."""
@@ -247,14 +508,7 @@ class InventoryProcessor:
         feature_data['scan_timestamp'] = datetime.now().isoformat()
 
         # Multi-user tracking info (for PostGIS sync in future versions)
-        import platform
-        import socket
-        import getpass
-
-        feature_data['scanned_by_user'] = getpass.getuser()  # Username
-        feature_data['scanned_by_machine'] = socket.gethostname()  # Computer name
-        feature_data['scanned_from_os'] = platform.system()  # Windows, Linux, Darwin
-        feature_data['scanned_from_os_version'] = platform.version()  # OS version details
+        feature_data.update(self._host_info)
 
         # Network path detection (UNC path vs local)
         file_path_str = str(file_path)
@@ -272,24 +526,18 @@ class InventoryProcessor:
 
         # Drive letter (Windows) or mount point (Unix)
         try:
-            if platform.system() == 'Windows':
-                import os
+            if self._is_windows:
                 drive = os.path.splitdrive(file_path_str)[0]
                 feature_data['drive_or_mount'] = drive if drive else None
             else:
                 # Unix - get mount point
-                import subprocess
-                result = subprocess.run(['df', file_path_str], capture_output=True, text=True)
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    if len(lines) > 1:
-                        mount_point = lines[1].split()[-1]
-                        feature_data['drive_or_mount'] = mount_point
+                feature_data['drive_or_mount'] = self._mount_for(file_path_str)
         except:
             feature_data['drive_or_mount'] = None
 
         try:
-            stat = file_path.stat()
+            # Taken during discovery; stat again only if that failed
+            stat = ds_info.get('stat') or file_path.stat()
             feature_data['file_size_bytes'] = stat.st_size
             feature_data['file_size_mb'] = round(stat.st_size / (1024*1024), 2)
             feature_data['file_created'] = datetime.fromtimestamp(stat.st_ctime).isoformat()
@@ -383,11 +631,11 @@ class InventoryProcessor:
         return round(score, 1)
 
     def _extract_vector_metadata(self, feature_data, ds_info):
-        """Extract vector-specific metadata."""
+        """Extract vector-specific metadata from the layer opened by _scan_file()."""
         try:
-            ds = ogr.Open(ds_info['path'])
+            ds = ds_info['dataset']
             if ds:
-                layer = ds.GetLayer(ds_info['layer_index'])
+                layer = ds_info['layer']
                 if layer:
                     feature_data['driver_name'] = ds.GetDriver().GetName()
                     feature_data['format'] = ds.GetDriver().GetName()
@@ -415,17 +663,16 @@ class InventoryProcessor:
                     layer_def = layer.GetLayerDefn()
                     field_count = layer_def.GetFieldCount()
                     feature_data['field_count'] = field_count
-                    feature_data['field_names'] = ','.join([layer_def.GetFieldDefn(i).GetName() for i in range(field_count)])
-                    feature_data['field_types'] = ','.join([layer_def.GetFieldDefn(i).GetTypeName() for i in range(field_count)])
-
-                ds = None
+                    # JSON arrays, so names containing commas survive the round trip
+                    feature_data['field_names'] = json.dumps([layer_def.GetFieldDefn(i).GetName() for i in range(field_count)], ensure_ascii=False)
+                    feature_data['field_types'] = json.dumps([layer_def.GetFieldDefn(i).GetTypeName() for i in range(field_count)], ensure_ascii=False)
         except Exception as e:
             feature_data['issues'] = str(e)
 
     def _extract_raster_metadata(self, feature_data, ds_info):
-        """Extract raster-specific metadata."""
+        """Extract raster-specific metadata from the dataset opened by _scan_file()."""
         try:
-            ds = gdal.Open(ds_info['path'], gdal.GA_ReadOnly)
+            ds = ds_info['dataset']
             if ds:
                 feature_data['driver_name'] = ds.GetDriver().ShortName
                 feature_data['format'] = ds.GetDriver().ShortName
@@ -467,8 +714,6 @@ class InventoryProcessor:
                     nodata = band.GetNoDataValue()
                     if nodata is not None:
                         feature_data['nodata_value'] = str(nodata)
-
-                ds = None
         except Exception as e:
             feature_data['issues'] = str(e)
 
@@ -500,90 +745,145 @@ class InventoryProcessor:
         for xml_path in xml_candidates:
             if xml_path.exists():
                 try:
-                    tree = ET.parse(xml_path)
-                    root = tree.getroot()
+                    found = self._read_metadata_xml(xml_path)
+                    root_tag = found['root']
 
                     feature_data['has_metadata_xml'] = True
                     feature_data['metadata_file_path'] = str(xml_path)
                     feature_data['metadata_present'] = True
 
                     # Detect standard
-                    if 'metadata' in root.tag.lower():
-                        if 'fgdc' in root.tag.lower() or any('idinfo' == child.tag for child in root):
+                    if 'metadata' in root_tag.lower():
+                        if 'fgdc' in root_tag.lower() or 'idinfo' in found['children']:
                             feature_data['metadata_standard'] = 'FGDC'
-                            self._parse_fgdc_metadata(feature_data, root)
-                        elif any('Esri' in child.tag for child in root):
+                            self._parse_fgdc_metadata(feature_data, found)
+                        elif any('Esri' in tag for tag in found['children']):
                             feature_data['metadata_standard'] = 'ESRI'
-                            self._parse_esri_metadata(feature_data, root)
-                        elif 'MD_Metadata' in root.tag:
+                            self._parse_esri_metadata(feature_data, found)
+                        elif 'MD_Metadata' in root_tag:
                             feature_data['metadata_standard'] = 'ISO 19115'
-                            self._parse_iso_metadata(feature_data, root)
-                    elif 'qgis' in root.tag.lower():
+                            self._parse_iso_metadata(feature_data, found)
+                    elif 'qgis' in root_tag.lower():
                         feature_data['metadata_standard'] = 'QGIS'
-                        self._parse_qgis_metadata(feature_data, root)
+                        self._parse_qgis_metadata(feature_data, found)
 
                     break  # Found metadata, stop looking
                 except:
                     pass
 
-    def _parse_fgdc_metadata(self, feature_data, root):
+    def _read_metadata_xml(self, xml_path):
+        """
+        Stream a metadata XML file, collecting what the parsers need.
+
+        Elements are cleared as soon as they end, so large documents are
+        never held in memory whole. Reading stops early when the root tag
+        matches no standard, or once a QGIS document's title and abstract
+        have been read.
+
+        Args:
+            xml_path: Path to the XML file
+
+        Returns:
+            Dict with the root tag, the set of tags of the root's children,
+            the text of the first element of each METADATA_XML_FIELDS tag
+            ('first'), all theme keyword texts and the first non-empty text
+            of an element whose tag contains 'title' ('esri_title')
+        """
+        found = {'root': None, 'children': set(), 'first': {},
+                 'themekeys': [], 'esri_title': None}
+        first_elems = {}
+        title_starts = {}
+        esri_title_pos = None
+        is_qgis = False
+        position = 0
+        depth = 0
+        root = None
+
+        with open(xml_path, 'rb') as source:
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if root is None:
+                        root = elem
+                        found['root'] = elem.tag
+                        root_tag = elem.tag.lower()
+                        if 'metadata' not in root_tag:
+                            if 'qgis' not in root_tag:
+                                break
+                            is_qgis = True
+                        continue
+
+                    if depth == 2:
+                        found['children'].add(elem.tag)
+                    # Document order decides which element counts as first
+                    if elem.tag in METADATA_XML_FIELDS and elem.tag not in first_elems:
+                        first_elems[elem.tag] = elem
+                    if 'title' in elem.tag.lower():
+                        title_starts[elem] = position
+                    position += 1
+                    continue
+
+                if elem is root:
+                    break
+
+                if first_elems.get(elem.tag) is elem:
+                    found['first'][elem.tag] = elem.text
+                elif elem.tag == 'themekey' and elem.text:
+                    found['themekeys'].append(elem.text)
+
+                start = title_starts.pop(elem, None)
+                if start is not None and elem.text and (
+                        esri_title_pos is None or start < esri_title_pos):
+                    esri_title_pos = start
+                    found['esri_title'] = elem.text
+
+                elem.clear()
+                depth -= 1
+                if depth == 1:
+                    # Drop the cleared subtree from the root as well
+                    root.clear()
+
+                if is_qgis and 'title' in found['first'] and 'abstract' in found['first']:
+                    break
+
+        return found
+
+    def _parse_fgdc_metadata(self, feature_data, found):
         """Parse FGDC metadata."""
         try:
-            # Title
-            title_elem = root.find('.//title')
-            if title_elem is not None and title_elem.text:
-                feature_data['layer_title'] = title_elem.text.strip()
-
-            # Abstract
-            abstract_elem = root.find('.//abstract')
-            if abstract_elem is not None and abstract_elem.text:
-                feature_data['layer_abstract'] = abstract_elem.text.strip()
+            # Title, abstract, lineage and constraints
+            for tag, field in METADATA_XML_FIELDS.items():
+                text = found['first'].get(tag)
+                if text:
+                    feature_data[field] = text.strip()
 
             # Keywords
-            keywords = []
-            for theme in root.findall('.//themekey'):
-                if theme.text:
-                    keywords.append(theme.text.strip())
+            keywords = [text.strip() for text in found['themekeys']]
             if keywords:
-                feature_data['keywords'] = ','.join(keywords)
-
-            # Lineage
-            lineage_elem = root.find('.//lineage')
-            if lineage_elem is not None and lineage_elem.text:
-                feature_data['lineage'] = lineage_elem.text.strip()
-
-            # Constraints
-            useconst_elem = root.find('.//useconst')
-            if useconst_elem is not None and useconst_elem.text:
-                feature_data['constraints'] = useconst_elem.text.strip()
+                feature_data['keywords'] = json.dumps(keywords, ensure_ascii=False)
         except:
             pass
 
-    def _parse_esri_metadata(self, feature_data, root):
+    def _parse_esri_metadata(self, feature_data, found):
         """Parse ESRI metadata."""
         try:
-            # Similar to FGDC but with ESRI-specific paths
-            for elem in root.iter():
-                if 'title' in elem.tag.lower() and elem.text:
-                    feature_data['layer_title'] = elem.text.strip()
-                    break
+            # First element with 'title' in its tag and some text
+            if found['esri_title']:
+                feature_data['layer_title'] = found['esri_title'].strip()
         except:
             pass
 
-    def _parse_iso_metadata(self, feature_data, root):
+    def _parse_iso_metadata(self, feature_data, found):
         """Parse ISO 19115 metadata."""
         pass  # Implement if needed
 
-    def _parse_qgis_metadata(self, feature_data, root):
+    def _parse_qgis_metadata(self, feature_data, found):
         """Parse QGIS .qmd metadata."""
         try:
-            title_elem = root.find('.//title')
-            if title_elem is not None and title_elem.text:
-                feature_data['layer_title'] = title_elem.text.strip()
-
-            abstract_elem = root.find('.//abstract')
-            if abstract_elem is not None and abstract_elem.text:
-                feature_data['layer_abstract'] = abstract_elem.text.strip()
+            for tag in ('title', 'abstract'):
+                text = found['first'].get(tag)
+                if text:
+                    feature_data[METADATA_XML_FIELDS[tag]] = text.strip()
         except:
             pass
 
@@ -710,8 +1010,6 @@ class InventoryProcessor:
         mem_provider.addFeatures(qgs_features)
 
         # Write to GeoPackage - use direct GDAL approach for better control
-        import os
-
         # Determine write mode
         db_exists = os.path.exists(output_path)
 
@@ -0,0 +1,249 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+
+# Create minimal fake qgis modules before importing the database manager
+qgis = types.ModuleType('qgis')
+qgis_core = types.ModuleType('qgis.core')
+
+
+class Qgis:
+    Info = 0
+    Warning = 1
+    Critical = 2
+    Success = 3
+
+
+class QgsMessageLog:
+    @staticmethod
+    def logMessage(message, tag='', level=Qgis.Info):
+        pass
+
+
+qgis_core.Qgis = Qgis
+qgis_core.QgsMessageLog = QgsMessageLog
+# Provide placeholders for names imported by the metadata writer
+qgis_core.QgsLayerMetadata = object
+qgis_core.QgsVectorLayer = object
+qgis_core.QgsRasterLayer = object
+qgis_core.QgsCoordinateReferenceSystem = object
+qgis_core.QgsBox3d = object
+qgis_core.QgsDateTimeRange = object
+
+
+class QSettings:
+    def value(self, key, default=None, type=None):
+        return default
+
+
+qgis_pyqt = types.ModuleType('qgis.PyQt')
+qgis_pyqt_qtcore = types.ModuleType('qgis.PyQt.QtCore')
+qgis_pyqt_qtcore.QSettings = QSettings
+qgis_pyqt_qtcore.QDateTime = object
+qgis_pyqt_qtcore.QFile = object
+qgis_pyqt_qtcore.QIODevice = object
+qgis_pyqt_qtcore.QTextStream = object
+qgis_pyqt_qtxml = types.ModuleType('qgis.PyQt.QtXml')
+qgis_pyqt_qtxml.QDomDocument = object
+
+sys.modules['qgis'] = qgis
+sys.modules['qgis.core'] = qgis_core
+sys.modules['qgis.PyQt'] = qgis_pyqt
+sys.modules['qgis.PyQt.QtCore'] = qgis_pyqt_qtcore
+sys.modules['qgis.PyQt.QtXml'] = qgis_pyqt_qtxml
+
+from Plugins.metadata_manager.db.manager import DatabaseManager
+from Plugins.metadata_manager.db.migrations import Migration, MigrationManager
+from Plugins.metadata_manager.db.schema import DatabaseSchema
+
+
+def create_inventory(db_path, rows):
+    """Create a minimal geospatial_inventory table with the given rows."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE geospatial_inventory (
+            fid INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT, layer_name TEXT, parent_directory TEXT,
+            data_type TEXT, format TEXT, crs_authid TEXT,
+            metadata_status TEXT, metadata_last_updated TEXT,
+            metadata_target TEXT, metadata_cached INTEGER,
+            retired_datetime TEXT
+        )
+    """)
+    conn.executemany(
+        """
+        INSERT INTO geospatial_inventory (
+            file_path, layer_name, parent_directory, data_type, format,
+            crs_authid, metadata_status, retired_datetime
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestDatabaseManagerStatistics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'inventory.gpkg')
+        create_inventory(self.db_path, [
+            ('/data/a.shp', 'a', 'data', 'vector', 'ESRI Shapefile', 'EPSG:4326', 'complete', None),
+            ('/data/b.shp', 'b', 'data', 'vector', 'ESRI Shapefile', 'EPSG:4326', None, None),
+            ('/data/c.tif', 'c', 'data', 'raster', 'GTiff', 'EPSG:3857', 'none', None),
+            ('/other/d.tif', 'd', 'other', 'raster', 'GTiff', None, 'partial', None),
+            ('/other/e.tif', 'e', 'other', 'raster', 'GTiff', None, 'none', '2025-01-01'),
+        ])
+        self.db = DatabaseManager()
+        self.assertTrue(self.db.connect(self.db_path))
+
+    def tearDown(self):
+        self.db.disconnect()
+        self.tmpdir.cleanup()
+
+    def test_summary_counts_null_and_none_status(self):
+        stats = self.db.get_inventory_statistics()
+        self.assertEqual(stats, {'total': 4, 'complete': 1, 'partial': 1, 'none': 2})
+
+    def test_grouped_statistics(self):
+        directories = self.db.get_statistics_by_directory()
+        self.assertEqual([d['directory'] for d in directories], ['data', 'other'])
+        self.assertEqual(directories[0]['none'], 2)
+        self.assertAlmostEqual(directories[0]['completion_pct'], 100 / 3)
+
+        crs = {row['crs']: row['total'] for row in self.db.get_statistics_by_crs()}
+        self.assertEqual(crs, {'EPSG:4326': 2, 'EPSG:3857': 1, 'Unknown': 1})
+
+        page = self.db.get_statistics_by_directory(limit=1, offset=1)
+        self.assertEqual([d['directory'] for d in page], ['other'])
+
+        recommendations = self.db.get_priority_recommendations(limit=1)
+        self.assertEqual(len(recommendations), 1)
+        self.assertEqual(recommendations[0]['count'], 1)
+
+    def test_statistics_refresh_after_external_write(self):
+        self.assertEqual(self.db.get_inventory_statistics()['complete'], 1)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE geospatial_inventory SET metadata_status = 'complete'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.get_inventory_statistics()['complete'], 4)
+
+    def test_statistics_refresh_after_own_write(self):
+        self.assertEqual(self.db.get_inventory_statistics()['complete'], 1)
+        self.assertTrue(self.db.update_inventory_metadata_status('/data/b.shp', 'b', 'complete'))
+        self.assertEqual(self.db.get_inventory_statistics()['complete'], 2)
+
+        with self.db.batch():
+            self.db.update_inventory_metadata_status('/data/c.tif', 'c', 'complete')
+        self.assertEqual(self.db.get_inventory_statistics()['complete'], 3)
+
+    def test_statistics_kept_after_rolled_back_batch(self):
+        stats = self.db.get_all_statistics()
+        with self.assertRaises(RuntimeError):
+            with self.db.batch():
+                self.db.update_inventory_metadata_status('/data/b.shp', 'b', 'complete')
+                raise RuntimeError('abort')
+        self.assertIs(self.db.get_all_statistics(), stats)
+        self.assertEqual(stats['summary']['complete'], 1)
+
+    def test_reconnect_reuses_open_connection(self):
+        connection = self.db.connection
+        self.assertTrue(self.db.connect(self.db_path))
+        self.assertIs(self.db.connection, connection)
+
+        other_path = os.path.join(self.tmpdir.name, 'other.gpkg')
+        create_inventory(other_path, [])
+        self.assertTrue(self.db.connect(other_path))
+        self.assertIsNot(self.db.connection, connection)
+        self.assertEqual(self.db.get_inventory_statistics()['total'], 0)
+
+    def test_reconnect_restores_dropped_indexes(self):
+        self.db.connection.execute("DROP INDEX idx_inventory_path_layer")
+        self.assertTrue(self.db.connect(self.db_path))
+        names = {row[0] for row in self.db.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn('idx_inventory_path_layer', names)
+
+    def test_with_block_keeps_shared_connection_open(self):
+        with self.db as db:
+            self.assertIsNotNone(db.get_inventory_statistics())
+        self.assertTrue(self.db.is_connected)
+
+        with DatabaseManager(self.db_path) as db:
+            self.assertTrue(db.is_connected)
+        self.assertFalse(db.is_connected)
+
+
+class TestCacheKeyIndex(unittest.TestCase):
+    def test_upsert_works_on_old_cache_with_plain_layer_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, 'inventory.gpkg')
+            conn = sqlite3.connect(db_path)
+            # 0.1.0 table, plus a non-unique index under the key index's name
+            conn.executescript("""
+                CREATE TABLE metadata_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    layer_path TEXT NOT NULL UNIQUE,
+                    layer_name TEXT NOT NULL,
+                    file_type TEXT,
+                    metadata_json TEXT NOT NULL,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_edited_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_written_date TIMESTAMP,
+                    target_location TEXT,
+                    in_sync INTEGER DEFAULT 1
+                );
+                CREATE INDEX idx_metadata_cache_layer ON metadata_cache(layer_path, layer_name);
+            """)
+            conn.close()
+
+            db = DatabaseManager()
+            self.assertTrue(db.connect(db_path))
+            try:
+                self.assertTrue(db.save_metadata_to_cache('/data/a.gpkg', 'roads', {'title': 'A'}))
+                self.assertTrue(db.save_metadata_to_cache('/data/a.gpkg', 'roads', {'title': 'B'}))
+            finally:
+                db.disconnect()
+
+
+class TestTitleCase(unittest.TestCase):
+    def test_convert_to_title_case(self):
+        db = DatabaseManager()
+        self.assertEqual(db._convert_to_title_case('roads_2024'), 'Roads 2024')
+        self.assertEqual(db._convert_to_title_case('us_census_tracts'), 'US Census Tracts')
+        self.assertEqual(db._convert_to_title_case('dem_10m'), 'DEM 10m')
+        self.assertEqual(db._convert_to_title_case('elev-dtm.TIF'), 'Elev DTM')
+        self.assertEqual(db._convert_to_title_case(''), 'Untitled Layer')
+
+
+class ChainedMigrations(MigrationManager):
+    def _register_migrations(self):
+        step = lambda db_manager: (True, '')
+        self.migrations = [
+            Migration('0.1.0', '0.2.0', 'a', step),
+            Migration('0.2.0', '0.3.0', 'b', step),
+            Migration('0.3.0', '0.1.0', 'c', step),
+        ]
+
+
+class TestMigrationPath(unittest.TestCase):
+    def test_chained_and_missing_paths(self):
+        manager = ChainedMigrations()
+        path = manager.get_migration_path('0.1.0', '0.3.0')
+        self.assertEqual([m.description for m in path], ['a', 'b'])
+        self.assertEqual(manager.get_migration_path('0.1.0', '0.4.0'), [])
+
+    def test_needs_upgrade(self):
+        manager = MigrationManager()
+        # A copy built at runtime, as read from the database
+        current = ''.join(list(DatabaseSchema.METADATA_SCHEMA_VERSION))
+        self.assertFalse(manager.needs_upgrade(current))
+        self.assertTrue(manager.needs_upgrade('0.1.0'))
+        self.assertTrue(manager.needs_upgrade(None))
+
+if __name__ == '__main__':
+    unittest.main()
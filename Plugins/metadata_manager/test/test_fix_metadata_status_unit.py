@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from Plugins.metadata_manager import fix_metadata_status as fms
+
+RTREE_TRIGGER = """CREATE TRIGGER rtree_geospatial_inventory_geom_update1
+AFTER UPDATE ON geospatial_inventory
+BEGIN
+    INSERT INTO trigger_log (fid) VALUES (NEW.fid);
+END"""
+
+
+def create_database(db_path, rows, cached):
+    """Create an inventory with a spatial index style trigger and a cache."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE geospatial_inventory (
+            fid INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT, layer_name TEXT,
+            metadata_status TEXT, metadata_cached INTEGER,
+            metadata_last_updated TEXT, retired_datetime TEXT
+        );
+        CREATE TABLE metadata_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            layer_path TEXT NOT NULL, layer_name TEXT NOT NULL,
+            metadata_json TEXT NOT NULL,
+            UNIQUE(layer_path, layer_name)
+        );
+        CREATE TABLE trigger_log (fid INTEGER);
+    """)
+    conn.execute(RTREE_TRIGGER)
+    conn.executemany(
+        "INSERT INTO geospatial_inventory (file_path, layer_name, metadata_status, metadata_cached) "
+        "VALUES (?, ?, ?, 1)",
+        rows
+    )
+    conn.executemany(
+        "INSERT INTO metadata_cache (layer_path, layer_name, metadata_json) VALUES (?, ?, '{}')",
+        cached
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestBatchedFix(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'inventory.gpkg')
+        create_database(
+            self.db_path,
+            [('/data/a.gpkg', f'layer{i}', 'complete') for i in range(7)]
+            + [('/data/b.shp', 'b', 'partial')],
+            [('/data/a.gpkg', 'layer0'), ('/data/a.gpkg', 'layer3')]
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def statuses(self):
+        conn = sqlite3.connect(self.db_path)
+        rows = dict(conn.execute("SELECT layer_name, metadata_status FROM geospatial_inventory"))
+        triggers = [row[0] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger'")]
+        logged = conn.execute("SELECT COUNT(*) FROM trigger_log").fetchone()[0]
+        conn.close()
+        return rows, triggers, logged
+
+    def test_batches_fix_statuses_and_restore_triggers(self):
+        with mock.patch.object(fms, 'BATCH_SIZE', 2), mock.patch.object(fms, 'print', create=True):
+            fms.fix_metadata_status(self.db_path)
+
+        rows, triggers, logged = self.statuses()
+        self.assertEqual(
+            [name for name, status in sorted(rows.items()) if status == 'none'],
+            ['layer1', 'layer2', 'layer4', 'layer5', 'layer6']
+        )
+        self.assertEqual(rows['layer0'], 'complete')
+        self.assertEqual(rows['b'], 'partial')
+        self.assertEqual(triggers, [RTREE_TRIGGER])
+        self.assertEqual(logged, 0)
+
+    def test_layer_cached_between_batches_is_kept(self):
+        def cache_layer_during_run(*args):
+            # Another session caches a layer after the first batch commits
+            if str(args[0]).startswith('  ...') and not self.cached_meanwhile:
+                conn = sqlite3.connect(self.db_path)
+                conn.execute("INSERT INTO metadata_cache (layer_path, layer_name, metadata_json) "
+                             "VALUES ('/data/a.gpkg', 'layer6', '{}')")
+                conn.commit()
+                conn.close()
+                self.cached_meanwhile = True
+
+        self.cached_meanwhile = False
+        with mock.patch.object(fms, 'BATCH_SIZE', 2), \
+                mock.patch.object(fms, 'print', cache_layer_during_run, create=True):
+            fms.fix_metadata_status(self.db_path)
+
+        rows, triggers, _ = self.statuses()
+        self.assertTrue(self.cached_meanwhile)
+        self.assertEqual(rows['layer6'], 'complete')
+        self.assertEqual(rows['layer5'], 'none')
+        self.assertEqual(triggers, [RTREE_TRIGGER])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,86 +1,274 @@
-import sys
-import types
-import unittest
-
-# Create minimal fake qgis modules before importing the processor
-qgis = types.ModuleType('qgis')
-qgis_core = types.ModuleType('qgis.core')
-qgis_PyQt = types.ModuleType('qgis.PyQt')
-qgis_PyQt_QtCore = types.ModuleType('qgis.PyQt.QtCore')
-
-class QVariant:
-    String = 1
-    Int = 2
-    LongLong = 3
-    Double = 4
-    Bool = 5
-
-class QgsField:
-    def __init__(self, name, type_val=None):
-        self._name = name
-        self._type_val = type_val
-    def name(self):
-        return self._name
-
-class QgsFields(list):
-    def append(self, f):
-        super().append(f)
-    def toList(self):
-        return list(self)
-
-# Populate the minimal qgis.core module attributes used by inventory_processor
-qgis_core.QgsField = QgsField
-qgis_core.QgsFields = QgsFields
-# Provide placeholders for other imported names to avoid import errors
-qgis_core.QgsVectorLayer = object
-qgis_core.QgsRasterLayer = object
-qgis_core.QgsCoordinateReferenceSystem = object
-qgis_core.QgsCoordinateTransform = object
-qgis_core.QgsProject = object
-qgis_core.QgsFeature = object
-qgis_core.QgsGeometry = object
-qgis_core.QgsRectangle = object
-qgis_core.QgsPointXY = object
-qgis_core.QgsVectorFileWriter = object
-qgis_core.QgsWkbTypes = object
-qgis_core.QgsMessageLog = object
-qgis_core.Qgis = object
-
-# Provide QVariant via qgis.PyQt.QtCore
-qgis_PyQt_QtCore.QVariant = QVariant
-qgis_PyQt.QtCore = qgis_PyQt_QtCore
-
-# Insert into sys.modules so imports use these fakes
-sys.modules['qgis'] = qgis
-sys.modules['qgis.core'] = qgis_core
-sys.modules['qgis.PyQt'] = qgis_PyQt
-sys.modules['qgis.PyQt.QtCore'] = qgis_PyQt_QtCore
-
-# Now import the InventoryProcessor
-from Plugins.metadata_manager.processors.inventory_processor import InventoryProcessor
-
-class TestInventoryProcessorFields(unittest.TestCase):
-    def test_create_fields_count_and_names(self):
-        params = {
-            'directory': '.',
-            'output_gpkg': 'out.gpkg',
-            'layer_name': 'inv',
-            'update_mode': False,
-            'include_vectors': True,
-            'include_rasters': True,
-            'include_tables': True,
-            'parse_metadata': False,
-            'include_sidecar': False,
-            'validate_files': False
-        }
-        proc = InventoryProcessor(params, feedback=None)
-        fields = proc._create_fields()
-        # Ensure fields is list-like and contains many items
-        self.assertTrue(hasattr(fields, 'toList') or isinstance(fields, list))
-        self.assertGreater(len(fields), 40)
-        names = [f.name() for f in fields]
-        for key in ('file_path', 'layer_name', 'data_type', 'file_size_bytes', 'metadata_status'):
-            self.assertIn(key, names)
-
-if __name__ == '__main__':
-    unittest.main()
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+# Create minimal fake qgis modules before importing the processor
+qgis = types.ModuleType('qgis')
+qgis_core = types.ModuleType('qgis.core')
+qgis_PyQt = types.ModuleType('qgis.PyQt')
+qgis_PyQt_QtCore = types.ModuleType('qgis.PyQt.QtCore')
+
+class QVariant:
+    String = 1
+    Int = 2
+    LongLong = 3
+    Double = 4
+    Bool = 5
+
+class QgsField:
+    def __init__(self, name, type_val=None):
+        self._name = name
+        self._type_val = type_val
+    def name(self):
+        return self._name
+
+class QgsCoordinateReferenceSystem:
+    def __init__(self, *args):
+        pass
+
+class QgsFields(list):
+    def append(self, f):
+        super().append(f)
+    def toList(self):
+        return list(self)
+
+# Populate the minimal qgis.core module attributes used by inventory_processor
+qgis_core.QgsField = QgsField
+qgis_core.QgsFields = QgsFields
+# Provide placeholders for other imported names to avoid import errors
+qgis_core.QgsVectorLayer = object
+qgis_core.QgsRasterLayer = object
+qgis_core.QgsCoordinateReferenceSystem = QgsCoordinateReferenceSystem
+qgis_core.QgsCoordinateTransform = object
+qgis_core.QgsProject = object
+qgis_core.QgsFeature = object
+qgis_core.QgsGeometry = object
+qgis_core.QgsRectangle = object
+qgis_core.QgsPointXY = object
+qgis_core.QgsVectorFileWriter = object
+qgis_core.QgsWkbTypes = object
+qgis_core.QgsMessageLog = object
+qgis_core.Qgis = object
+
+# Provide QVariant via qgis.PyQt.QtCore
+qgis_PyQt_QtCore.QVariant = QVariant
+qgis_PyQt.QtCore = qgis_PyQt_QtCore
+
+# Insert into sys.modules so imports use these fakes
+sys.modules['qgis'] = qgis
+sys.modules['qgis.core'] = qgis_core
+sys.modules['qgis.PyQt'] = qgis_PyQt
+sys.modules['qgis.PyQt.QtCore'] = qgis_PyQt_QtCore
+
+# Now import the InventoryProcessor
+from Plugins.metadata_manager.processors import inventory_processor
+from Plugins.metadata_manager.processors.inventory_processor import InventoryProcessor
+
+
+def make_params(**overrides):
+    params = {
+        'directory': '/data',
+        'output_gpkg': 'out.gpkg',
+        'layer_name': 'inv',
+        'update_mode': False,
+        'include_vectors': True,
+        'include_rasters': True,
+        'include_tables': True,
+        'parse_metadata': False,
+        'include_sidecar': False,
+        'validate_files': False
+    }
+    params.update(overrides)
+    return params
+
+
+def make_entry(name):
+    return types.SimpleNamespace(path=f'/data/{name}', name=name, stat=lambda: None)
+
+
+class FakeLayer:
+    def __init__(self, name, geom_type=1):
+        self._name = name
+        self._geom_type = geom_type
+    def GetName(self):
+        return self._name
+    def GetGeomType(self):
+        return self._geom_type
+
+
+class FakeDataset:
+    def __init__(self, layers):
+        self._layers = layers
+    def GetLayerCount(self):
+        return len(self._layers)
+    def GetLayer(self, index):
+        return self._layers[index]
+
+class TestInventoryProcessorFields(unittest.TestCase):
+    def test_create_fields_count_and_names(self):
+        params = {
+            'directory': '.',
+            'output_gpkg': 'out.gpkg',
+            'layer_name': 'inv',
+            'update_mode': False,
+            'include_vectors': True,
+            'include_rasters': True,
+            'include_tables': True,
+            'parse_metadata': False,
+            'include_sidecar': False,
+            'validate_files': False
+        }
+        proc = InventoryProcessor(params, feedback=None)
+        fields = proc._create_fields()
+        # Ensure fields is list-like and contains many items
+        self.assertTrue(hasattr(fields, 'toList') or isinstance(fields, list))
+        self.assertGreater(len(fields), 40)
+        names = [f.name() for f in fields]
+        for key in ('file_path', 'layer_name', 'data_type', 'file_size_bytes', 'metadata_status'):
+            self.assertIn(key, names)
+
+class TestScanFile(unittest.TestCase):
+    def test_opens_file_once_and_keeps_layer_errors(self):
+        dataset = FakeDataset([FakeLayer('roads'), FakeLayer('broken'), FakeLayer('attrs', 100)])
+        fake_ogr = types.SimpleNamespace(Open=mock.Mock(return_value=dataset), wkbNone=100)
+        config = {}
+        fake_gdal = types.SimpleNamespace(
+            Open=mock.Mock(), GA_ReadOnly=0, GetDriverCount=lambda: 0,
+            GetThreadLocalConfigOption=lambda key, default: config.get(key, default),
+            SetThreadLocalConfigOption=config.__setitem__
+        )
+
+        proc = InventoryProcessor(make_params())
+        error = ValueError('bad layer')
+
+        def extract(ds_info, root_path, existing_inventory):
+            if ds_info['layer_name'] == 'broken':
+                raise error
+            self.assertIs(ds_info['dataset'], dataset)
+            self.assertEqual(config['GDAL_DISABLE_READDIR_ON_OPEN'], 'TRUE')
+            return {'layer_name': ds_info['layer_name'], 'data_type': ds_info['type']}
+
+        with mock.patch.object(inventory_processor, 'ogr', fake_ogr), \
+                mock.patch.object(inventory_processor, 'gdal', fake_gdal), \
+                mock.patch.object(proc, '_extract_metadata', side_effect=extract):
+            results = proc._scan_file(make_entry('multi.gpkg'), '/data', {})
+
+        fake_ogr.Open.assert_called_once_with('/data/multi.gpkg')
+        fake_gdal.Open.assert_not_called()
+        self.assertIsNone(config['GDAL_DISABLE_READDIR_ON_OPEN'])
+        self.assertEqual(results[0], {'layer_name': 'roads', 'data_type': 'vector'})
+        self.assertIs(results[1], error)
+        self.assertEqual(results[2], {'layer_name': 'attrs', 'data_type': 'table'})
+
+
+class TestProbeExtensions(unittest.TestCase):
+    def tearDown(self):
+        inventory_processor._probe_extensions.cache_clear()
+
+    def test_adds_extensions_declared_by_drivers(self):
+        def driver(extensions, vector, raster):
+            items = {
+                'DMD_EXTENSIONS': extensions,
+                'DCAP_VECTOR': 'YES' if vector else None,
+                'DCAP_RASTER': 'YES' if raster else None,
+            }
+            return types.SimpleNamespace(GetMetadataItem=items.get)
+
+        drivers = [driver('S57 000', True, False), driver('RSW', False, True), driver(None, True, True)]
+        fake_gdal = types.SimpleNamespace(
+            GetDriverCount=lambda: len(drivers), GetDriver=drivers.__getitem__,
+            DMD_EXTENSIONS='DMD_EXTENSIONS', DCAP_VECTOR='DCAP_VECTOR', DCAP_RASTER='DCAP_RASTER'
+        )
+
+        inventory_processor._probe_extensions.cache_clear()
+        with mock.patch.object(inventory_processor, 'gdal', fake_gdal):
+            vector_exts, raster_exts = inventory_processor._probe_extensions()
+
+        self.assertTrue({'.s57', '.000', '.shp', '.e00'} <= vector_exts)
+        self.assertNotIn('.rsw', vector_exts)
+        self.assertTrue({'.rsw', '.tif', '.bmp'} <= raster_exts)
+        self.assertNotIn('.s57', raster_exts)
+
+
+class TestProcess(unittest.TestCase):
+    def run_process(self, entries, scan_file, feedback=None):
+        proc = InventoryProcessor(make_params(), feedback=feedback)
+        written = mock.Mock()
+        with mock.patch.object(proc, '_discover_geospatial_files', return_value=entries), \
+                mock.patch.object(proc, '_scan_file', side_effect=scan_file), \
+                mock.patch.object(proc, '_write_geopackage', written):
+            result = proc.process()
+        return result, written
+
+    def test_results_keep_discovery_order_and_count_errors(self):
+        entries = [make_entry(f'layer{i}.shp') for i in range(6)]
+
+        def scan_file(entry, root_path, existing_inventory):
+            # Later files finish first
+            index = entries.index(entry)
+            time.sleep((len(entries) - index) * 0.01)
+            if index == 2:
+                return [RuntimeError('unreadable')]
+            if index == 4:
+                raise OSError('gone')
+            return [{'file_path': entry.path, 'data_type': 'vector'}]
+
+        result, written = self.run_process(entries, scan_file)
+
+        features = written.call_args[0][2]
+        self.assertEqual(
+            [f['file_path'] for f in features],
+            ['/data/layer0.shp', '/data/layer1.shp', '/data/layer3.shp', '/data/layer5.shp']
+        )
+        self.assertEqual(result['stats']['errors'], 2)
+        self.assertEqual(result['stats']['vectors'], 4)
+
+    def test_no_layers_found_warns_and_writes_nothing(self):
+        feedback = mock.Mock()
+        feedback.isCanceled.return_value = False
+
+        result, written = self.run_process(
+            [make_entry('notes.csv')], lambda entry, root_path, existing_inventory: [], feedback
+        )
+
+        written.assert_not_called()
+        feedback.reportError.assert_called_with("No geospatial files found in directory", False)
+        self.assertEqual(result['stats']['total'], 0)
+
+    def test_cancel_skips_pending_files(self):
+        entries = [make_entry(f'layer{i}.shp') for i in range(5)]
+        scanned = []
+        release = threading.Event()
+
+        def scan_file(entry, root_path, existing_inventory):
+            scanned.append(entry.name)
+            if entry is entries[1]:
+                release.wait(5)
+            return [{'file_path': entry.path, 'data_type': 'vector'}]
+
+        checks = []
+
+        def is_canceled():
+            checks.append(True)
+            if len(checks) < 2:
+                return False
+            # Let the running scan finish once the pending ones are cancelled
+            threading.Timer(0.1, release.set).start()
+            return True
+
+        feedback = mock.Mock()
+        feedback.isCanceled.side_effect = is_canceled
+
+        with mock.patch.object(inventory_processor, 'EXTRACT_WORKERS', 1):
+            result, written = self.run_process(entries, scan_file, feedback)
+
+        self.assertEqual(scanned, ['layer0.shp', 'layer1.shp'])
+        self.assertEqual([f['file_path'] for f in written.call_args[0][2]], ['/data/layer0.shp'])
+        self.assertEqual(result['stats']['total'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ Author: John Zastrow
 License: MIT
 """
 
-__version__ = "0.3.0"
+__version__ = "0.3.1"
+
+import os
 
 from qgis.PyQt import QtWidgets, QtCore
 from qgis.PyQt.QtCore import Qt
@@ -124,7 +126,7 @@ class LayerSelectorDialog(QtWidgets.QDialog):
                 ORDER BY layer_name
             """
 
-            rows = self.db_manager.execute_query(query)
+            rows = self.db_manager.iter_query(query)
 
             if rows is None:
                 self.status_label.setText("⚠ Error loading layers from inventory")
@@ -132,20 +134,18 @@ class LayerSelectorDialog(QtWidgets.QDialog):
 
             # Store all rows for filtering
             self.all_layers = []
-            for row in rows:
+            for layer_name, file_path, status, data_type, file_format, _ in rows:
                 # Extract full directory path and file name from file_path
-                import os
-                file_path = row['file_path']
                 directory = os.path.dirname(file_path) if file_path else 'Unknown'
                 file_name = os.path.basename(file_path) if file_path else 'Unknown'
 
                 self.all_layers.append({
-                    'name': row['layer_name'] or 'Unknown',
+                    'name': layer_name or 'Unknown',
                     'path': file_path,
                     'file_name': file_name,
-                    'status': row['status'],
-                    'data_type': row['data_type'] or 'Unknown',
-                    'format': row['format'] or 'Unknown',
+                    'status': status,
+                    'data_type': data_type or 'Unknown',
+                    'format': file_format or 'Unknown',
                     'directory': directory
                 })
 
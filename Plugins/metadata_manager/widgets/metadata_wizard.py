@@ -7,7 +7,7 @@ Author: John Zastrow
 License: MIT
 """
 
-__version__ = "0.4.0"
+__version__ = "0.4.1"
 
 from qgis.PyQt import QtWidgets, QtCore, QtGui
 from qgis.PyQt.QtCore import Qt, pyqtSignal
@@ -1431,7 +1431,7 @@ class MetadataWizard(QtWidgets.QWidget):
                 self.step3.set_data(metadata)
         else:
             # No cached metadata - try smart defaults from inventory
-            smart_defaults = self.db_manager.get_smart_defaults(layer_path, layer_name)
+            smart_defaults = self.db_manager.get_smart_defaults_core(layer_path, layer_name)
 
             if smart_defaults:
                 # Convert smart defaults to metadata format
@@ -47,13 +47,13 @@ def test_schema_creation():
                 raise
 
         # Get initial data
-        initial_data = DatabaseSchema.get_initial_data()
-        print(f"\nInserting {len(initial_data)} initial data statements")
+        initial_data = DatabaseSchema.get_initial_data_batches()
+        print(f"\nInserting {len(initial_data)} initial data batches")
 
-        for i, data_sql in enumerate(initial_data, 1):
+        for i, (data_sql, rows) in enumerate(initial_data, 1):
             print(f"  Executing insert {i}/{len(initial_data)}...", end='')
             try:
-                cursor.execute(data_sql)
+                cursor.executemany(data_sql, rows)
                 print(" ✓")
             except Exception as e:
                 print(f" ✗ FAILED")